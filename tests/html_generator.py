@@ -4,361 +4,696 @@ Generador de HTML mejorado para reportes de tests del sistema CBR.
 Utiliza la estética de la web y aprovecha toda la información de los JSON.
 """
 
+import os
 import json
-import base64
+import math
+import gzip
+import mmap
+from html import escape
 from pathlib import Path
 from datetime import datetime
+from bisect import bisect_right
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Final, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa el módulo json estándar
+    orjson = None
+
+try:
+    from pybase64 import b64encode
+except ImportError:  # pybase64 es opcional (codificación SIMD): se usa base64 estándar
+    from base64 import b64encode
 
 
 def load_json(filepath):
-    """Carga un archivo JSON."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Carga un archivo JSON (cacheado mientras no cambie su mtime; no mutar el resultado)."""
+    path = Path(filepath)
+    return _load_json_cached(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path_str, mtime_ns):
+    """Parsea el JSON desde bytes; `mtime_ns` forma parte de la clave de caché."""
+    raw = Path(path_str).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:  # p.ej. NaN/Infinity escritos por json.dump
+            pass
+    return json.loads(raw)
+
+
+def clear_report_caches():
+    """Vacía las cachés de JSON parseados e imágenes codificadas (la clave ya incluye `st_mtime_ns`: solo hace falta si se reescribe un fichero con el mismo mtime)."""
+    _load_json_cached.cache_clear()
+    _image_base64_cached.cache_clear()
 
 
 def encode_image_base64(image_path):
-    """Codifica una imagen en base64 para incrustarla en HTML."""
-    if not Path(image_path).exists():
+    """Codifica una imagen en base64 como data URI (comparte con `_image_panel` la caché por ruta y mtime)."""
+    try:
+        chunks = _image_base64_cached(str(image_path), os.stat(image_path).st_mtime_ns)
+    except FileNotFoundError:
         return None
-    with open(image_path, 'rb') as f:
-        encoded = base64.b64encode(f.read()).decode('utf-8')
-    return f"data:image/png;base64,{encoded}"
+    return f"data:image/png;base64,{b''.join(chunks).decode('ascii')}"
 
 
-def get_html_template(title, has_plots=False):
-    """Genera la plantilla HTML base con la estética de la web."""
-    plots_html = ""
-    if has_plots:
-        plots_html = """
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        """
-    
-    return f"""<!DOCTYPE html>
+# Bloque de lectura para codificar imágenes por partes: múltiplo de 3 para que
+# los trozos en base64 se concatenen sin relleno intermedio
+IMAGE_CHUNK_SIZE = 3 * 65536
+
+
+def _image_base64_chunks(f, chunk_size=IMAGE_CHUNK_SIZE):
+    """Codifica una imagen ya abierta en base64 por trozos (bytes ASCII) leyéndola mediante mmap."""
+    if os.fstat(f.fileno()).st_size == 0:  # mmap no admite ficheros vacíos
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+        for start in range(0, len(view), chunk_size):
+            yield b64encode(view[start:start + chunk_size])
+
+
+@lru_cache(maxsize=16)
+def _image_base64_cached(path_str, mtime_ns):
+    """Trozos base64 de una imagen; `mtime_ns` forma parte de la clave y la invalida al regenerar el plot."""
+    with open(path_str, 'rb') as f:
+        return tuple(_image_base64_chunks(f))
+
+
+# Plots PNG que incluyen los reportes (también son entradas al decidir si un reporte está al día)
+PLOTS_DIR: Final[Path] = Path('data/plots')
+WEIGHT_EVOLUTION_PNG: Final[str] = 'weight_evolution.png'
+FEEDBACK_CORRELATION_PNG: Final[str] = 'feedback_correlation.png'
+FEEDBACK_EVOLUTION_PNG: Final[str] = 'feedback_evolution.png'
+
+
+def _image_panel(image_path, heading, alt, output_path, embed_images=False):
+    """Panel con la imagen (enlazada por ruta relativa o embebida en base64); no genera nada si la imagen no existe."""
+    try:
+        if embed_images:
+            chunks = _image_base64_cached(str(image_path), os.stat(image_path).st_mtime_ns)
+        else:
+            os.stat(image_path)
+    except FileNotFoundError:
+        return
+    yield f"""
+        <div class="panel">
+            <h2>{heading}</h2>
+            <div class="plot-container">
+"""
+    if embed_images:
+        # Los trozos en base64 se escriben sin concatenarlos con el HTML
+        yield '                <img src="data:image/png;base64,'
+        yield from chunks
+        yield f'" style="width: 100%; height: auto;" alt="{alt}">'
+    else:
+        # Referencia externa: el navegador la carga en paralelo y la cachea entre reportes
+        src = Path(os.path.relpath(image_path, Path(output_path).parent)).as_posix()
+        yield f'                <img src="{escape(src)}" loading="lazy" style="width: 100%; height: auto;" alt="{alt}">'
+    yield """
+            </div>
+        </div>
+            """
+
+
+# Plotly + helpers de página: un único ResizeObserver agrupa los redimensionados
+# de todos los plots en un frame (en lugar del listener de `responsive: true`)
+# y los divs con data-lazy="1" se dibujan al hacerse visibles. Plotly se carga
+# con `defer` (sin bloquear el parseo) y regPlot espera a DOMContentLoaded.
+PLOTLY_HEAD = """
+    <script src="https://cdn.plot.ly/plotly-basic-2.35.2.min.js" defer></script>
+    <script>
+        const BASE_LAYOUT = {
+            plot_bgcolor: '#faf7f1',
+            paper_bgcolor: '#ffffff',
+            font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+        };
+        
+        (function () {
+            var pending = new Set();
+            var scheduled = false;
+            var observer = new ResizeObserver(entries => {
+                entries.forEach(e => pending.add(e.target));
+                if (scheduled) return;
+                scheduled = true;
+                requestAnimationFrame(() => {
+                    pending.forEach(el => Plotly.Plots.resize(el));
+                    pending.clear();
+                    scheduled = false;
+                });
+            });
+            // Los plots marcados con data-lazy="1" se dibujan al entrar en pantalla
+            var lazyPlots = new Map();
+            var lazyObserver = new IntersectionObserver(entries => {
+                entries.forEach(e => {
+                    if (!e.isIntersecting || !lazyPlots.has(e.target)) return;
+                    lazyObserver.unobserve(e.target);
+                    lazyPlots.get(e.target)();
+                    lazyPlots.delete(e.target);
+                });
+            }, {rootMargin: '200px'});
+            window.regResize = el => observer.observe(el);
+            var register = (id, traces, layout) => {
+                var el = document.getElementById(id);
+                var draw = () => Plotly.newPlot(el, traces, layout).then(() => regResize(el));
+                if (el.dataset.lazy !== '1') return draw();
+                lazyPlots.set(el, draw);
+                lazyObserver.observe(el);
+            };
+            // Los scripts `defer` se ejecutan antes de DOMContentLoaded: ahí Plotly ya existe
+            window.regPlot = (id, traces, layout) => {
+                if (document.readyState !== 'loading') return register(id, traces, layout);
+                document.addEventListener('DOMContentLoaded', () => register(id, traces, layout));
+            };
+        })();
+    </script>
+"""
+
+
+# Caracteres que no pueden aparecer tal cual dentro de un <script> (p.ej. `</script>`)
+# ni en literales JS antiguos; se escapan como secuencias \uXXXX, válidas en JSON
+SCRIPT_ESCAPES = str.maketrans({
+    '<': '\\u003c',
+    '>': '\\u003e',
+    '&': '\\u0026',
+    '\u2028': '\\u2028',
+    '\u2029': '\\u2029',
+})
+
+
+def _finite(obj):
+    """Sustituye recursivamente los floats no finitos (NaN/Infinity) por None, como hace orjson."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _to_json(obj):
+    """Serializa datos Python a un literal JSON para incrustarlo en el JS del reporte (NaN/Infinity -> null)."""
+    if orjson is not None:
+        text = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    else:
+        # Misma salida compacta, en UTF-8 y sin NaN/Infinity (inválidos para JSON.parse) que orjson
+        text = json.dumps(_finite(obj), separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+    return text.translate(SCRIPT_ESCAPES)
+
+
+# Máximo de puntos por serie en los plots interactivos; por encima se submuestrea
+MAX_PLOT_POINTS = 500
+
+
+def _downsample(values, max_points=MAX_PLOT_POINTS):
+    """Submuestrea una serie con paso fijo a como mucho `max_points` (>= 2) puntos, conservando el primero y el último."""
+    if len(values) <= max_points:
+        return values
+    # Paso calculado sobre max_points - 1 intervalos: deja sitio para añadir el último punto
+    step = -(-(len(values) - 1) // (max_points - 1))
+    sampled = values[::step]
+    if (len(values) - 1) % step:
+        sampled.append(values[-1])
+    return sampled
+
+
+def _js_float_array(values):
+    """Literal JS `Float64Array` para una serie numérica (Plotly la acepta sin convertir cada número)."""
+    text = _to_json(values)
+    # None/NaN se serializan como null y Float64Array lo convertiría en 0: con huecos queda como array (Plotly no los dibuja)
+    if 'null' in text:
+        return text
+    return f"new Float64Array({text})"
+
+
+def _json_parse_vars(element_id, **series):
+    """Emite las series en un `<script type="application/json">` y abre el `<script>` que las declara con un único `JSON.parse`."""
+    # `_to_json` escribe NaN/Infinity como null: un valor no finito no invalida el JSON.parse de toda la página
+    names = ', '.join(f"{name} = D.{name}" for name in series)
+    return (f'        <script id="{element_id}" type="application/json">{_to_json(series)}</script>\n'
+            f"        <script>\n"
+            f"            var D = JSON.parse(document.getElementById('{element_id}').textContent);\n"
+            f"            var {names};\n")
+
+
+def _summary_ns(summary, **defaults):
+    """Vuelca el resumen sobre sus valores por defecto en un SimpleNamespace."""
+    return SimpleNamespace(**{**defaults, **summary})
+
+
+# Tarjeta de la rejilla `stats-grid` (misma sangría que los bloques escritos a mano);
+# se rellena con `%` y una tupla (etiqueta, clase, valor): más rápido que `.format` en bucles
+STAT_CARD = """
+                <div class="stat-card">
+                    <div class="stat-label">%s</div>
+                    <div class="stat-value%s">%s</div>
+                </div>"""
+
+
+def _stat_cards(cards):
+    """Rejilla `stats-grid` con una tarjeta por cada (etiqueta, valor ya formateado, clase CSS del valor)."""
+    return ('<div class="stats-grid">'
+            + ''.join(STAT_CARD % (label, f' {css}' if css else '', value) for label, value, css in cards)
+            + '\n            </div>')
+
+
+# Tamaño del buffer de escritura de los reportes (evita escrituras pequeñas en FS lentos)
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def _atomic_output(*paths):
+    """Entrega rutas `.tmp` para cada destino y las renombra con `os.replace` solo si todo fue bien."""
+    tmp_paths = [f"{path}.tmp" for path in paths]
+    try:
+        yield tmp_paths
+    except BaseException:
+        for tmp_path in tmp_paths:
+            Path(tmp_path).unlink(missing_ok=True)
+        raise
+    for tmp_path, path in zip(tmp_paths, paths):
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def _html_writer(output_path):
+    """Abre el reporte y su copia `.html.gz` y devuelve un `write(fragmento)` (str o bytes) que escribe en ambos."""
+    if str(output_path).endswith('.gz'):
+        # Salida pedida ya comprimida (`*.html.gz`): solo se escribe el stream gzip
+        with _atomic_output(output_path) as (gz_tmp,), \
+                open(gz_tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as raw, \
+                gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=0) as gz:
+            def write(fragment):
+                gz.write(fragment if isinstance(fragment, bytes) else fragment.encode('utf-8'))
+            yield write
+        return
+    
+    with _atomic_output(output_path, f"{output_path}.gz") as (html_tmp, gz_tmp), \
+            open(html_tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as f, \
+            open(gz_tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as raw, \
+            gzip.GzipFile(filename='', mode='wb', fileobj=raw, compresslevel=6, mtime=0) as gz:
+        def write(fragment):
+            payload = fragment if isinstance(fragment, bytes) else fragment.encode('utf-8')
+            f.write(payload)
+            gz.write(payload)
+        yield write
+
+
+def _write_html(output_path, html):
+    """Escribe el HTML en disco (UTF-8) junto a una copia comprimida `.html.gz`."""
+    # Página ya completa: una sola escritura por fichero, sin buffer intermedio
+    payload = html.encode('utf-8')
+    if str(output_path).endswith('.gz'):
+        with _atomic_output(output_path) as (gz_tmp,):
+            Path(gz_tmp).write_bytes(gzip.compress(payload, compresslevel=6, mtime=0))
+        return
+    with _atomic_output(output_path, f"{output_path}.gz") as (html_tmp, gz_tmp):
+        Path(html_tmp).write_bytes(payload)
+        Path(gz_tmp).write_bytes(gzip.compress(payload, compresslevel=6, mtime=0))
+
+
+def _write_html_stream(output_path, fragments):
+    """Escribe los fragmentos según se generan, sin construir la página completa en memoria."""
+    # Cada página enlaza `styles.css`: se asegura junto al reporte también al llamar a un generador suelto
+    ensure_report_css(Path(output_path).parent)
+    with _html_writer(output_path) as write:
+        for fragment in fragments:
+            write(fragment)
+
+
+# Máximo de escenarios por fichero HTML; por encima el reporte se divide en partes
+MAX_SCENARIOS_PER_FILE = 200
+
+PARTS_INDEX_PANEL = """
+        <div class="header">
+            <h1>{title}</h1>
+            <p class="subtitle">{total} scenarios split into {count} parts</p>
+        </div>
+        
+        <div class="panel">
+            <h2>📑 Report Parts</h2>
+            <ul>
+{links}            </ul>
+        </div>
+"""
+
+
+def _part_path(output_path, k):
+    """Ruta de la parte `k` de un reporte paginado (`report_x.html` -> `report_x_part1.html`)."""
+    output_path = Path(output_path)
+    base, _, ext = output_path.name.partition('.')
+    return output_path.with_name(f"{base}_part{k}.{ext}")
+
+
+def _remove_stale_parts(output_path, keep=0):
+    """Borra las partes (y sus `.gz`) por encima de `keep` que dejara una generación anterior con más escenarios."""
+    output_path = Path(output_path)
+    base, _, ext = output_path.name.partition('.')
+    prefix = f"{base}_part"
+    with os.scandir(output_path.parent) as entries:
+        names = [entry.name for entry in entries if entry.name.startswith(prefix)]
+    for name in names:
+        number, _, rest = name[len(prefix):].partition('.')
+        if number.isdigit() and int(number) > keep and rest in (ext, f"{ext}.gz"):
+            os.remove(output_path.parent / name)
+
+
+def _write_paginated(output_path, title, data, fragments):
+    """Escribe los escenarios en partes de MAX_SCENARIOS_PER_FILE y en `output_path` un índice que las enlaza."""
+    scenarios = data['scenarios']
+    links = []
+    for k, start in enumerate(range(0, len(scenarios), MAX_SCENARIOS_PER_FILE), 1):
+        chunk = scenarios[start:start + MAX_SCENARIOS_PER_FILE]
+        part_path = _part_path(output_path, k)
+        _write_html_stream(part_path, fragments({**data, 'scenarios': chunk}, start + 1))
+        links.append(f'                <li><a href="{part_path.name}">Part {k}: scenarios {start + 1}–{start + len(chunk)}</a></li>\n')
+    
+    _write_html(output_path, get_html_template(title) + PARTS_INDEX_PANEL.format(
+        title=title, total=len(scenarios), count=len(links), links=''.join(links)
+    ) + get_html_footer())
+    _remove_stale_parts(output_path, keep=len(links))
+
+
+# Hoja de estilos compartida por todos los reportes; se escribe una vez en
+# htmls/styles.css y cada página la enlaza en lugar de repetirla inline
+REPORT_CSS = """:root {
+    --surface: #ffffff;
+    --ink: #0f172a;
+    --muted: #5b6474;
+    --accent: #0f766e;
+    --accent-2: #e07a5f;
+    --line: #e1dacf;
+}
+
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    background: linear-gradient(135deg, #faf7f1 0%, #f4f1eb 100%);
+    color: var(--ink);
+    padding: 28px;
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+}
+
+.header {
+    margin-bottom: 32px;
+    text-align: center;
+}
+
+.header h1 {
+    font-size: 42px;
+    letter-spacing: -0.02em;
+    margin-bottom: 8px;
+    background: linear-gradient(135deg, var(--accent) 0%, var(--accent-2) 100%);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+
+.header .subtitle {
+    color: var(--muted);
+    font-size: 16px;
+}
+
+.panel {
+    background: var(--surface);
+    border-radius: 18px;
+    border: 1px solid var(--line);
+    padding: 24px;
+    margin-bottom: 24px;
+    box-shadow: 0 14px 30px rgba(15, 23, 42, 0.08);
+}
+
+.panel h2 {
+    font-size: 26px;
+    margin-bottom: 20px;
+    color: var(--accent);
+}
+
+.panel h3 {
+    font-size: 20px;
+    margin: 24px 0 12px 0;
+    color: var(--ink);
+}
+
+.stats-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
+    gap: 16px;
+    margin-bottom: 24px;
+}
+
+.stat-card {
+    background: #faf7f1;
+    border: 1px solid var(--line);
+    border-radius: 14px;
+    padding: 16px;
+    text-align: center;
+}
+
+.stat-label {
+    font-size: 12px;
+    text-transform: uppercase;
+    letter-spacing: 0.08em;
+    color: var(--muted);
+    margin-bottom: 8px;
+}
+
+.stat-value {
+    font-size: 32px;
+    font-weight: 700;
+    color: var(--accent);
+}
+
+.stat-value.positive {
+    color: #059669;
+}
+
+.stat-value.negative {
+    color: #dc2626;
+}
+
+.comparison-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 20px 0;
+}
+
+.comparison-table th {
+    background: var(--accent);
+    color: white;
+    padding: 12px;
+    text-align: left;
+    font-size: 14px;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+}
+
+.comparison-table td {
+    padding: 12px;
+    border-bottom: 1px solid var(--line);
+}
+
+.comparison-table tr:hover {
+    background: #faf7f1;
+}
+
+.plot-container {
+    margin: 24px 0;
+    padding: 20px;
+    background: white;
+    border-radius: 12px;
+    border: 1px solid var(--line);
+}
+
+.plot-title {
+    font-size: 18px;
+    font-weight: 600;
+    margin-bottom: 16px;
+    color: var(--accent);
+}
+
+.alert {
+    padding: 14px 18px;
+    border-radius: 12px;
+    margin: 16px 0;
+    font-size: 14px;
+}
+
+.alert.info {
+    background: rgba(15, 118, 110, 0.08);
+    color: var(--accent);
+    border: 1px solid rgba(15, 118, 110, 0.2);
+}
+
+.alert.success {
+    background: rgba(5, 150, 105, 0.08);
+    color: #059669;
+    border: 1px solid rgba(5, 150, 105, 0.2);
+}
+
+.alert.warning {
+    background: rgba(224, 122, 95, 0.08);
+    color: var(--accent-2);
+    border: 1px solid rgba(224, 122, 95, 0.2);
+}
+
+.badge {
+    display: inline-block;
+    padding: 4px 10px;
+    border-radius: 999px;
+    font-size: 12px;
+    font-weight: 600;
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+}
+
+.badge.success {
+    background: rgba(5, 150, 105, 0.15);
+    color: #059669;
+}
+
+.badge.neutral {
+    background: rgba(91, 100, 116, 0.15);
+    color: var(--muted);
+}
+
+.badge.warning {
+    background: rgba(224, 122, 95, 0.15);
+    color: var(--accent-2);
+}
+
+.footer {
+    margin-top: 40px;
+    text-align: center;
+    color: var(--muted);
+    font-size: 14px;
+    padding: 20px;
+    border-top: 1px solid var(--line);
+}
+
+code {
+    background: #f3f4f6;
+    padding: 2px 6px;
+    border-radius: 4px;
+    font-family: 'Monaco', 'Courier New', monospace;
+    font-size: 0.9em;
+    color: var(--accent-2);
+}
+"""
+
+
+def write_report_css(htmls_dir):
+    """Escribe `styles.css` (y su copia `.gz`) en el directorio de reportes."""
+    _write_html(Path(htmls_dir) / 'styles.css', REPORT_CSS)
+
+
+# Un reporte también queda obsoleto si cambia este módulo (plantillas, CSS, JS)
+GENERATOR_MTIME_NS: Final[int] = os.stat(__file__).st_mtime_ns
+
+
+def ensure_report_css(htmls_dir):
+    """Escribe `styles.css` (y su `.gz`) si falta alguno o es anterior a este módulo."""
+    htmls_dir = Path(htmls_dir)
+    try:
+        if min(os.stat(htmls_dir / name).st_mtime_ns for name in ('styles.css', 'styles.css.gz')) >= GENERATOR_MTIME_NS:
+            return
+    except FileNotFoundError:
+        pass
+    write_report_css(htmls_dir)
+
+
+# Partes fijas de la cabecera: solo el título y el bloque de Plotly varían
+HEAD_OPEN = """<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - CBR System Report</title>
-    <style>
-        :root {{
-            --surface: #ffffff;
-            --ink: #0f172a;
-            --muted: #5b6474;
-            --accent: #0f766e;
-            --accent-2: #e07a5f;
-            --line: #e1dacf;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #faf7f1 0%, #f4f1eb 100%);
-            color: var(--ink);
-            padding: 28px;
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-        
-        .header {{
-            margin-bottom: 32px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            font-size: 42px;
-            letter-spacing: -0.02em;
-            margin-bottom: 8px;
-            background: linear-gradient(135deg, var(--accent) 0%, var(--accent-2) 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        
-        .header .subtitle {{
-            color: var(--muted);
-            font-size: 16px;
-        }}
-        
-        .panel {{
-            background: var(--surface);
-            border-radius: 18px;
-            border: 1px solid var(--line);
-            padding: 24px;
-            margin-bottom: 24px;
-            box-shadow: 0 14px 30px rgba(15, 23, 42, 0.08);
-        }}
-        
-        .panel h2 {{
-            font-size: 26px;
-            margin-bottom: 20px;
-            color: var(--accent);
-        }}
-        
-        .panel h3 {{
-            font-size: 20px;
-            margin: 24px 0 12px 0;
-            color: var(--ink);
-        }}
-        
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-            gap: 16px;
-            margin-bottom: 24px;
-        }}
-        
-        .stat-card {{
-            background: #faf7f1;
-            border: 1px solid var(--line);
-            border-radius: 14px;
-            padding: 16px;
-            text-align: center;
-        }}
-        
-        .stat-label {{
-            font-size: 12px;
-            text-transform: uppercase;
-            letter-spacing: 0.08em;
-            color: var(--muted);
-            margin-bottom: 8px;
-        }}
-        
-        .stat-value {{
-            font-size: 32px;
-            font-weight: 700;
-            color: var(--accent);
-        }}
-        
-        .stat-value.positive {{
-            color: #059669;
-        }}
-        
-        .stat-value.negative {{
-            color: #dc2626;
-        }}
-        
-        .comparison-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        
-        .comparison-table th {{
-            background: var(--accent);
-            color: white;
-            padding: 12px;
-            text-align: left;
-            font-size: 14px;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-        
-        .comparison-table td {{
-            padding: 12px;
-            border-bottom: 1px solid var(--line);
-        }}
-        
-        .comparison-table tr:hover {{
-            background: #faf7f1;
-        }}
-        
-        .plot-container {{
-            margin: 24px 0;
-            padding: 20px;
-            background: white;
-            border-radius: 12px;
-            border: 1px solid var(--line);
-        }}
-        
-        .plot-title {{
-            font-size: 18px;
-            font-weight: 600;
-            margin-bottom: 16px;
-            color: var(--accent);
-        }}
-        
-        .alert {{
-            padding: 14px 18px;
-            border-radius: 12px;
-            margin: 16px 0;
-            font-size: 14px;
-        }}
-        
-        .alert.info {{
-            background: rgba(15, 118, 110, 0.08);
-            color: var(--accent);
-            border: 1px solid rgba(15, 118, 110, 0.2);
-        }}
-        
-        .alert.success {{
-            background: rgba(5, 150, 105, 0.08);
-            color: #059669;
-            border: 1px solid rgba(5, 150, 105, 0.2);
-        }}
-        
-        .alert.warning {{
-            background: rgba(224, 122, 95, 0.08);
-            color: var(--accent-2);
-            border: 1px solid rgba(224, 122, 95, 0.2);
-        }}
-        
-        .badge {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 999px;
-            font-size: 12px;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-        
-        .badge.success {{
-            background: rgba(5, 150, 105, 0.15);
-            color: #059669;
-        }}
-        
-        .badge.neutral {{
-            background: rgba(91, 100, 116, 0.15);
-            color: var(--muted);
-        }}
-        
-        .badge.warning {{
-            background: rgba(224, 122, 95, 0.15);
-            color: var(--accent-2);
-        }}
-        
-        .footer {{
-            margin-top: 40px;
-            text-align: center;
-            color: var(--muted);
-            font-size: 14px;
-            padding: 20px;
-            border-top: 1px solid var(--line);
-        }}
-        
-        code {{
-            background: #f3f4f6;
-            padding: 2px 6px;
-            border-radius: 4px;
-            font-family: 'Monaco', 'Courier New', monospace;
-            font-size: 0.9em;
-            color: var(--accent-2);
-        }}
-    </style>
-    {plots_html}
-</head>
+    <title>"""
+
+HEAD_MID = """ - CBR System Report</title>
+    <link rel="stylesheet" href="styles.css">
+    """
+
+BODY_OPEN = """</head>
 <body>
     <div class="container">
 """
 
 
-def get_html_footer():
-    """Genera el pie de página HTML."""
-    return """
+@lru_cache(maxsize=None)
+def get_html_head(title, has_plots=False):
+    """Genera el documento hasta antes de `</head>`, para páginas que abren su propio `<body>`."""
+    plots_html = PLOTLY_HEAD if has_plots else ""
+    return HEAD_OPEN + title + HEAD_MID + plots_html + "\n"
+
+
+@lru_cache(maxsize=None)
+def get_html_template(title, has_plots=False):
+    """Genera la plantilla HTML base con la estética de la web (memoizada por título)."""
+    return get_html_head(title, has_plots) + BODY_OPEN
+
+
+# Pie de página fijo alrededor del timestamp
+FOOTER_HEAD = """
     </div>
     <div class="footer">
-        <p>Generated on {timestamp}</p>
+        <p>Generated on """
+
+FOOTER_TAIL = """</p>
         <p>CBR Chef System - Experimental Results Report</p>
     </div>
 </body>
 </html>
-""".format(timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+"""
 
 
-def generate_adaptive_weights_html(data, output_path):
-    """Genera HTML para test de adaptive weights con comparativas y gráficos."""
-    html = get_html_template("Adaptive Weight Learning", has_plots=True)
-    
-    # Header
-    html += """
+# Formato del timestamp del pie y timestamp común de la tanda en curso (None fuera de una tanda)
+FOOTER_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_batch_timestamp = None
+
+
+def _set_batch_timestamp(timestamp):
+    """Fija el timestamp del pie para todos los reportes de una tanda (inicializador del pool)."""
+    global _batch_timestamp
+    _batch_timestamp = timestamp
+
+
+def get_html_footer():
+    """Genera el pie de página HTML."""
+    return _footer_for(_batch_timestamp or datetime.now().strftime(FOOTER_TIME_FORMAT))
+
+
+@lru_cache(maxsize=1)
+def _footer_for(timestamp):
+    """Construye el pie de página para un timestamp (reutilizado dentro del mismo segundo)."""
+    return FOOTER_HEAD + timestamp + FOOTER_TAIL
+
+
+# Partes estáticas del reporte de adaptive weights, pre-codificadas en UTF-8 al importar
+ADAPTIVE_WEIGHTS_PAGE_OPEN = (get_html_template("Adaptive Weight Learning", has_plots=True) + """
         <div class="header">
             <h1>🎯 Adaptive Weight Learning</h1>
             <p class="subtitle">Comparative Analysis: Static vs Adaptive Weight Systems</p>
         </div>
-    """
-    
-    # Summary stats
-    static_data = data['systems']['static']['results']
-    adaptive_data = data['systems']['adaptive']['results']
-    
-    static_avg_top = sum(r['top_similarity'] for r in static_data) / len(static_data)
-    adaptive_avg_top = sum(r['top_similarity'] for r in adaptive_data) / len(adaptive_data)
-    improvement = ((adaptive_avg_top - static_avg_top) / static_avg_top) * 100
-    
-    html += """
-        <div class="panel">
-            <h2>📊 Summary Statistics</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">Static Avg Similarity</div>
-                    <div class="stat-value">{:.2%}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Adaptive Avg Similarity</div>
-                    <div class="stat-value positive">{:.2%}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Improvement</div>
-                    <div class="stat-value {}">{:+.2f}%</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Iterations Tested</div>
-                    <div class="stat-value">{}</div>
-                </div>
-            </div>
-        </div>
-    """.format(
-        static_avg_top,
-        adaptive_avg_top,
-        "positive" if improvement > 0 else "negative",
-        improvement,
-        len(static_data)
-    )
-    
-    # Detailed comparison - AHORA CON PLOTS
-    html += """
-        <div class="panel">
-            <h2>📊 Performance Comparison</h2>
-            <div class="plot-container">
-                <div id="similarityComparisonPlot"></div>
-            </div>
-        </div>
-        
-        <div class="panel">
-            <h2>📈 Similarity Trends</h2>
-            <div class="plot-container">
-                <div id="trendsPlot"></div>
-            </div>
-        </div>
-        
-        <script>
-            // Prepare comparison data
-            var iterations = [];
-            var staticTop = [];
-            var adaptiveTop = [];
-            var staticAvg = [];
-            var adaptiveAvg = [];
-    """
-    
-    for i, (s, a) in enumerate(zip(static_data, adaptive_data), 1):
-        html += f"""
-            iterations.push({i});
-            staticTop.push({s['top_similarity']});
-            adaptiveTop.push({a['top_similarity']});
-            staticAvg.push({s['avg_similarity']});
-            adaptiveAvg.push({a['avg_similarity']});
-        """
-    
-    html += """
+    """).encode('utf-8')
+
+ADAPTIVE_WEIGHTS_PLOTS_SCRIPT = """
             // Comparison plot
             var trace1 = {
                 x: iterations,
@@ -397,52 +732,132 @@ def generate_adaptive_weights_html(data, output_path):
             };
             
             var compLayout = {
+                ...BASE_LAYOUT,
                 title: 'Static vs Adaptive: Similarity Performance',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Similarity Score', range: [0, 1]},
                 hovermode: 'x unified',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'},
                 showlegend: true,
                 legend: {x: 0.7, y: 0.1}
             };
             
-            Plotly.newPlot('similarityComparisonPlot', [trace1, trace2, trace3, trace4], compLayout, {responsive: true});
+            regPlot('similarityComparisonPlot', [trace1, trace2, trace3, trace4], compLayout);
             
             // Improvement trend
-            var improvements = [];
-            for (var i = 0; i < iterations.length; i++) {
-                improvements.push((adaptiveTop[i] - staticTop[i]) * 100);
-            }
-            
             var improvementTrace = {
                 x: iterations,
                 y: improvements,
                 type: 'bar',
                 name: 'Improvement (%)',
                 marker: {
-                    color: improvements.map(v => v > 0 ? '#059669' : '#dc2626')
+                    color: improvementColors
                 }
             };
             
             var trendLayout = {
+                ...BASE_LAYOUT,
                 title: 'Adaptive Improvement Over Static (%)',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Improvement (%)', zeroline: true},
-                hovermode: 'closest',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                hovermode: 'closest'
             };
             
-            Plotly.newPlot('trendsPlot', [improvementTrace], trendLayout, {responsive: true});
+            regPlot('trendsPlot', [improvementTrace], trendLayout);
         </script>
+    """.encode('utf-8')
+
+
+def generate_adaptive_weights_html(data, output_path, embed_images=False):
+    """Genera HTML para test de adaptive weights con comparativas y gráficos."""
+    _write_html_stream(output_path, _adaptive_weights_fragments(data, output_path, embed_images))
+    
+    return output_path
+
+
+def _adaptive_weights_fragments(data, output_path, embed_images):
+    """Genera los fragmentos del reporte de adaptive weights en orden, sin acumular la página."""
+    yield ADAPTIVE_WEIGHTS_PAGE_OPEN
+    
+    # Summary stats
+    static_data = data['systems']['static']['results']
+    adaptive_data = data['systems']['adaptive']['results']
+    
+    # Series extraídas una sola vez: sirven para las medias y para los plots
+    static_top = [r['top_similarity'] for r in static_data]
+    adaptive_top = [r['top_similarity'] for r in adaptive_data]
+    static_avg = [r['avg_similarity'] for r in static_data]
+    adaptive_avg = [r['avg_similarity'] for r in adaptive_data]
+    
+    static_avg_top = sum(static_top) / len(static_top)
+    adaptive_avg_top = sum(adaptive_top) / len(adaptive_top)
+    improvement = ((adaptive_avg_top - static_avg_top) / static_avg_top) * 100
+    
+    yield f"""
+        <div class="panel">
+            <h2>📊 Summary Statistics</h2>
+            <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-label">Static Avg Similarity</div>
+                    <div class="stat-value">{static_avg_top:.2%}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Adaptive Avg Similarity</div>
+                    <div class="stat-value positive">{adaptive_avg_top:.2%}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Improvement</div>
+                    <div class="stat-value {'positive' if improvement > 0 else 'negative'}">{improvement:+.2f}%</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Iterations Tested</div>
+                    <div class="stat-value">{len(static_data)}</div>
+                </div>
+            </div>
+        </div>
+    """
+    
+    # Detailed comparison - AHORA CON PLOTS
+    yield """
+        <div class="panel">
+            <h2>📊 Performance Comparison</h2>
+            <div class="plot-container">
+                <div id="similarityComparisonPlot"></div>
+            </div>
+        </div>
+        
+        <div class="panel">
+            <h2>📈 Similarity Trends</h2>
+            <div class="plot-container">
+                <div id="trendsPlot"></div>
+            </div>
+        </div>
+        
+        <script>
+    """
+    
+    # Series completas como literales JSON (una asignación por array, sin push por iteración)
+    n = min(len(static_data), len(adaptive_data))
+    # Cada serie se reduce una sola vez y se reutiliza para el plot y para la mejora
+    static_top_points = _downsample(static_top[:n])
+    adaptive_top_points = _downsample(adaptive_top[:n])
+    # Mejora (%) y su color precalculados aquí en lugar de con un bucle/.map en el navegador
+    improvements = [(adaptive - static) * 100 for adaptive, static in zip(adaptive_top_points, static_top_points)]
+    yield f"""
+            // Prepare comparison data
+            var iterations = {_to_json(_downsample(list(range(1, n + 1))))};
+            var staticTop = {_js_float_array(static_top_points)};
+            var adaptiveTop = {_js_float_array(adaptive_top_points)};
+            var staticAvg = {_js_float_array(_downsample(static_avg[:n]))};
+            var adaptiveAvg = {_js_float_array(_downsample(adaptive_avg[:n]))};
+            var improvements = {_js_float_array(improvements)};
+            var improvementColors = {_to_json(['#059669' if v > 0 else '#dc2626' for v in improvements])};
     """
     
+    yield ADAPTIVE_WEIGHTS_PLOTS_SCRIPT
+    
     # Weight evolution (if available in adaptive data)
     if 'weights' in adaptive_data[0]:
-        html += """
+        yield """
         <div class="panel">
             <h2>⚖️ Weight Evolution Over Iterations</h2>
             <div class="plot-container">
@@ -450,35 +865,30 @@ def generate_adaptive_weights_html(data, output_path):
             </div>
         </div>
         <script>
-            var weights = [];
-            var iterations = [];
         """
         
-        # Extraer evolución de pesos
-        weight_keys = list(adaptive_data[0]['weights'].keys())
-        weight_evolution = {key: [] for key in weight_keys}
-        
-        for i, result in enumerate(adaptive_data, 1):
-            html += f"iterations.push({i});\n"
-            for key in weight_keys:
-                weight_evolution[key].append(result['weights'][key])
+        # Extraer evolución de pesos: una sola pasada por resultado y un trace por peso
+        weight_rows = [result['weights'] for result in adaptive_data]
+        iterations = _downsample(list(range(1, len(weight_rows) + 1)))
+        weight_traces = [
+            {
+                'x': iterations,
+                'y': _downsample([weights[key] for weights in weight_rows]),
+                'mode': 'lines+markers',
+                'name': key,
+                'line': {'width': 2},
+                'marker': {'size': 8},
+            }
+            for key in weight_rows[0]
+        ]
         
-        # Crear traces para plotly
-        html += "var traces = [];\n"
-        for key in weight_keys:
-            html += f"""
-            traces.push({{
-                x: iterations,
-                y: {weight_evolution[key]},
-                mode: 'lines+markers',
-                name: '{key}',
-                line: {{width: 2}},
-                marker: {{size: 8}}
-            }});
-            """
+        yield f"""
+            var traces = {_to_json(weight_traces)};
+        """
         
-        html += """
+        yield """
             var layout = {
+                ...BASE_LAYOUT,
                 title: 'Weight Adaptation Throughout Iterations',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Weight Value'},
@@ -486,47 +896,40 @@ def generate_adaptive_weights_html(data, output_path):
                 showlegend: true,
                 height: 500
             };
-            Plotly.newPlot('weightsPlot', traces, layout);
+            regPlot('weightsPlot', traces, layout);
         </script>
         """
     
     # Plot evolution image if exists
-    plot_path = Path('data/plots/weight_evolution.png')
-    if plot_path.exists():
-        img_data = encode_image_base64(plot_path)
-        if img_data:
-            html += f"""
-        <div class="panel">
-            <h2>📈 Weight Evolution Visualization</h2>
-            <div class="plot-container">
-                <img src="{img_data}" style="width: 100%; height: auto;" alt="Weight Evolution">
-            </div>
-        </div>
-            """
-    
-    html += get_html_footer()
+    yield from _image_panel(PLOTS_DIR / WEIGHT_EVOLUTION_PNG, '📈 Weight Evolution Visualization', 'Weight Evolution', output_path, embed_images)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    yield get_html_footer()
 
 
-def generate_adaptive_learning_html(data, output_path):
-    """Genera HTML para test de adaptive learning."""
-    html = get_html_template("Adaptive Learning Evaluation", has_plots=True)
-    
-    summary = data['summary']
-    
-    html += """
+# Partes estáticas del reporte de adaptive learning, pre-codificadas en UTF-8 al importar
+ADAPTIVE_LEARNING_PAGE_OPEN = (get_html_template("Adaptive Learning Evaluation", has_plots=True) + """
         <div class="header">
             <h1>🧠 Adaptive Learning Evaluation</h1>
             <p class="subtitle">Comparative Performance Analysis</p>
         </div>
-    """
+    """).encode('utf-8')
+
+
+def generate_adaptive_learning_html(data, output_path, embed_images=False):
+    """Genera HTML para test de adaptive learning."""
+    _write_html_stream(output_path, _adaptive_learning_fragments(data, output_path, embed_images))
+    
+    return output_path
+
+
+def _adaptive_learning_fragments(data, output_path, embed_images):
+    """Genera los fragmentos del reporte de adaptive learning en orden, sin acumular la página."""
+    yield ADAPTIVE_LEARNING_PAGE_OPEN
+    
+    summary = data['summary']
     
     # Main metrics
-    html += f"""
+    yield f"""
         <div class="panel">
             <h2>📊 Key Performance Indicators</h2>
             <div class="stats-grid">
@@ -567,7 +970,7 @@ def generate_adaptive_learning_html(data, output_path):
     """
     
     # Performance comparison
-    html += f"""
+    yield f"""
         <div class="panel">
             <h2>🔬 Detailed Comparison</h2>
             <table class="comparison-table">
@@ -607,7 +1010,7 @@ def generate_adaptive_learning_html(data, output_path):
     winner = "Adaptive" if summary['adaptive_better'] else "Static"
     alert_class = "success" if summary['adaptive_better'] else "info"
     
-    html += f"""
+    yield f"""
         <div class="panel">
             <h2>💡 Conclusion</h2>
             <div class="alert {alert_class}">
@@ -618,96 +1021,20 @@ def generate_adaptive_learning_html(data, output_path):
     """
     
     # Plot if exists
-    plot_path = Path('data/plots/feedback_correlation.png')
-    if plot_path.exists():
-        img_data = encode_image_base64(plot_path)
-        if img_data:
-            html += f"""
-        <div class="panel">
-            <h2>📈 Performance Correlation</h2>
-            <div class="plot-container">
-                <img src="{img_data}" style="width: 100%; height: auto;" alt="Feedback Correlation">
-            </div>
-        </div>
-            """
-    
-    html += get_html_footer()
+    yield from _image_panel(PLOTS_DIR / FEEDBACK_CORRELATION_PNG, '📈 Performance Correlation', 'Feedback Correlation', output_path, embed_images)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    yield get_html_footer()
 
 
-def generate_semantic_retrieve_html(data, output_path):
-    """Genera HTML para test de semantic retrieve."""
-    html = get_html_template("Semantic Similarity Retrieval", has_plots=True)
-    
-    html += """
+# Partes estáticas del reporte de semantic retrieve, pre-codificadas en UTF-8 al importar
+SEMANTIC_RETRIEVE_PAGE_OPEN = (get_html_template("Semantic Similarity Retrieval", has_plots=True) + """
         <div class="header">
             <h1>🔍 Semantic Similarity Retrieval</h1>
             <p class="subtitle">Recipe Retrieval with Semantic Similarity Analysis</p>
         </div>
-    """
-    
-    test_results = data.get('cultural_preferences', [])
-    
-    # Summary stats
-    total_tests = len(test_results)
-    total_retrieved = sum(t.get('cases_retrieved', 0) for t in test_results)
-    avg_retrieved = total_retrieved / total_tests if total_tests > 0 else 0
-    
-    html += f"""
-        <div class="panel">
-            <h2>📊 Retrieval Statistics</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">Cultures Tested</div>
-                    <div class="stat-value">{total_tests}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Total Retrieved</div>
-                    <div class="stat-value">{total_retrieved}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Avg Retrieved per Culture</div>
-                    <div class="stat-value">{avg_retrieved:.1f}</div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="panel">
-            <h2>📈 Similarity Scores by Culture</h2>
-            <div class="plot-container">
-                <div id="cultureSimilarityPlot"></div>
-            </div>
-        </div>
-        
-        <div class="panel">
-            <h2>🎯 Cultural Match Analysis</h2>
-            <div class="plot-container">
-                <div id="culturalMatchPlot"></div>
-            </div>
-        </div>
-        
-        <script>
-            var cultures = [];
-            var topScores = [];
-            var avgScores = [];
-            var matchCounts = [];
-    """
-    
-    for test in test_results:
-        culture = test.get('target_culture', 'unknown')
-        metrics = test.get('metrics', {})
-        html += f"""
-            cultures.push('{culture}');
-            topScores.push({metrics.get('top_similarity', 0)});
-            avgScores.push({metrics.get('avg_similarity', 0)});
-            matchCounts.push({metrics.get('exact_cultural_matches', 0)});
-        """
-    
-    html += """
+    """).encode('utf-8')
+
+SEMANTIC_RETRIEVE_PLOTS_SCRIPT = """
             // Similarity scores plot
             var topTrace = {
                 x: cultures,
@@ -726,16 +1053,14 @@ def generate_semantic_retrieve_html(data, output_path):
             };
             
             var similarityLayout = {
+                ...BASE_LAYOUT,
                 title: 'Top vs Average Similarity by Culture',
                 xaxis: {title: 'Culture'},
                 yaxis: {title: 'Similarity Score', range: [0, 1]},
-                barmode: 'group',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                barmode: 'group'
             };
             
-            Plotly.newPlot('cultureSimilarityPlot', [topTrace, avgTrace], similarityLayout, {responsive: true});
+            regPlot('cultureSimilarityPlot', [topTrace, avgTrace], similarityLayout);
             
             // Cultural match plot
             var matchTrace = {
@@ -743,126 +1068,103 @@ def generate_semantic_retrieve_html(data, output_path):
                 y: matchCounts,
                 type: 'bar',
                 marker: {
-                    color: matchCounts.map(v => v === 5 ? '#059669' : v >= 3 ? '#f59e0b' : '#dc2626')
+                    color: matchColors
                 },
-                text: matchCounts.map(v => v + '/5'),
+                text: matchLabels,
                 textposition: 'outside'
             };
             
             var matchLayout = {
+                ...BASE_LAYOUT,
                 title: 'Exact Cultural Matches (out of 5 retrieved)',
                 xaxis: {title: 'Culture'},
-                yaxis: {title: 'Number of Matches', range: [0, 6]},
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                yaxis: {title: 'Number of Matches', range: [0, 6]}
             };
             
-            Plotly.newPlot('culturalMatchPlot', [matchTrace], matchLayout, {responsive: true});
+            regPlot('culturalMatchPlot', [matchTrace], matchLayout);
         </script>
-    """
-    
-    html += get_html_footer()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    """.encode('utf-8')
 
 
-def generate_user_simulation_html(data, output_path):
-    """Genera HTML para test de user simulation con plots interactivos."""
-    html = get_html_template("Multi-User Simulation", has_plots=True)
+def generate_semantic_retrieve_html(data, output_path):
+    """Genera HTML para test de semantic retrieve."""
+    _write_html_stream(output_path, _semantic_retrieve_fragments(data))
     
-    html += """
-        <div class="header">
-            <h1>👥 Multi-User Simulation</h1>
-            <p class="subtitle">System Performance Under Multi-User Load</p>
-        </div>
-    """
+    return output_path
+
+
+def _semantic_retrieve_fragments(data):
+    """Genera los fragmentos del reporte de semantic retrieve en orden, sin acumular la página."""
+    yield SEMANTIC_RETRIEVE_PAGE_OPEN
     
-    params = data['parameters']
-    iterations = data['iterations']
+    test_results = data.get('cultural_preferences', [])
     
-    # Calculate summary stats
-    avg_feedback = sum(i['avg_feedback_score'] for i in iterations) / len(iterations)
-    total_retained = sum(i['cases_retained'] for i in iterations)
-    avg_success_rate = sum(i['success_rate'] for i in iterations) / len(iterations)
+    # Summary stats
+    total_tests = len(test_results)
+    total_retrieved = sum(t.get('cases_retrieved', 0) for t in test_results)
+    avg_retrieved = total_retrieved / total_tests if total_tests > 0 else 0
     
-    html += f"""
+    yield f"""
         <div class="panel">
-            <h2>📊 Simulation Parameters & Results</h2>
+            <h2>📊 Retrieval Statistics</h2>
             <div class="stats-grid">
                 <div class="stat-card">
-                    <div class="stat-label">Concurrent Users</div>
-                    <div class="stat-value">{params['num_users']}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Total Iterations</div>
-                    <div class="stat-value">{params['iterations']}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Avg Feedback Score</div>
-                    <div class="stat-value positive">{avg_feedback:.2f}/5</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Success Rate</div>
-                    <div class="stat-value positive">{avg_success_rate:.1%}</div>
+                    <div class="stat-label">Cultures Tested</div>
+                    <div class="stat-value">{total_tests}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Total Cases Retained</div>
-                    <div class="stat-value">{total_retained}</div>
+                    <div class="stat-label">Total Retrieved</div>
+                    <div class="stat-value">{total_retrieved}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Final Case Count</div>
-                    <div class="stat-value">{iterations[-1]['current_case_count']}</div>
+                    <div class="stat-label">Avg Retrieved per Culture</div>
+                    <div class="stat-value">{avg_retrieved:.1f}</div>
                 </div>
             </div>
         </div>
-    """
-    
-    # Interactive plots with Plotly
-    html += """
-        <div class="panel">
-            <h2>📈 Feedback Score Evolution</h2>
-            <div class="plot-container">
-                <div id="feedbackPlot"></div>
-            </div>
-        </div>
         
         <div class="panel">
-            <h2>📦 Case Base Growth</h2>
+            <h2>📈 Similarity Scores by Culture</h2>
             <div class="plot-container">
-                <div id="caseGrowthPlot"></div>
+                <div id="cultureSimilarityPlot"></div>
             </div>
         </div>
         
         <div class="panel">
-            <h2> Success Rate & Retention</h2>
+            <h2>🎯 Cultural Match Analysis</h2>
             <div class="plot-container">
-                <div id="performancePlot"></div>
+                <div id="culturalMatchPlot"></div>
             </div>
         </div>
         
         <script>
-            // Prepare data
-            var iterations = [];
-            var feedbackScores = [];
-            var caseCounts = [];
-            var casesRetained = [];
-            var successRates = [];
     """
     
-    for iter_data in iterations:
-        html += f"""
-            iterations.push({iter_data['iteration']});
-            feedbackScores.push({iter_data['avg_feedback_score']});
-            caseCounts.push({iter_data['current_case_count']});
-            casesRetained.push({iter_data['cases_retained']});
-            successRates.push({iter_data['success_rate'] * 100});
-        """
+    metrics_list = [test.get('metrics', {}) for test in test_results]
+    match_counts = [m.get('exact_cultural_matches', 0) for m in metrics_list]
+    yield f"""
+            var cultures = {_to_json([test.get('target_culture', 'unknown') for test in test_results])};
+            var topScores = {_js_float_array([m.get('top_similarity', 0) for m in metrics_list])};
+            var avgScores = {_js_float_array([m.get('avg_similarity', 0) for m in metrics_list])};
+            var matchCounts = {_to_json(match_counts)};
+            var matchColors = {_to_json(['#059669' if v == 5 else '#f59e0b' if v >= 3 else '#dc2626' for v in match_counts])};
+            var matchLabels = {_to_json([f'{v}/5' for v in match_counts])};
+    """
+    
+    yield SEMANTIC_RETRIEVE_PLOTS_SCRIPT
     
-    html += """
+    yield get_html_footer()
+
+
+# Partes estáticas del reporte de user simulation, pre-codificadas en UTF-8 al importar
+USER_SIMULATION_PAGE_OPEN = (get_html_template("Multi-User Simulation", has_plots=True) + """
+        <div class="header">
+            <h1>👥 Multi-User Simulation</h1>
+            <p class="subtitle">System Performance Under Multi-User Load</p>
+        </div>
+    """).encode('utf-8')
+
+USER_SIMULATION_PLOTS_SCRIPT = """
             // Feedback score plot
             var feedbackTrace = {
                 x: iterations,
@@ -874,16 +1176,14 @@ def generate_user_simulation_html(data, output_path):
             };
             
             var feedbackLayout = {
+                ...BASE_LAYOUT,
                 title: 'User Satisfaction Over Time',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Feedback Score (0-5)', range: [0, 5]},
-                hovermode: 'closest',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                hovermode: 'closest'
             };
             
-            Plotly.newPlot('feedbackPlot', [feedbackTrace], feedbackLayout, {responsive: true});
+            regPlot('feedbackPlot', [feedbackTrace], feedbackLayout);
             
             // Case growth plot
             var caseTrace = {
@@ -897,16 +1197,14 @@ def generate_user_simulation_html(data, output_path):
             };
             
             var caseLayout = {
+                ...BASE_LAYOUT,
                 title: 'Case Base Size Evolution',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Number of Cases'},
-                hovermode: 'closest',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                hovermode: 'closest'
             };
             
-            Plotly.newPlot('caseGrowthPlot', [caseTrace], caseLayout, {responsive: true});
+            regPlot('caseGrowthPlot', [caseTrace], caseLayout);
             
             // Performance plot (dual axis)
             var retentionTrace = {
@@ -929,6 +1227,7 @@ def generate_user_simulation_html(data, output_path):
             };
             
             var performanceLayout = {
+                ...BASE_LAYOUT,
                 title: 'Retention vs Success Rate',
                 xaxis: {title: 'Iteration'},
                 yaxis: {title: 'Cases Retained', side: 'left'},
@@ -938,116 +1237,117 @@ def generate_user_simulation_html(data, output_path):
                     side: 'right',
                     range: [0, 100]
                 },
-                hovermode: 'x unified',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                hovermode: 'x unified'
             };
             
-            Plotly.newPlot('performancePlot', [retentionTrace, successTrace], performanceLayout, {responsive: true});
+            regPlot('performancePlot', [retentionTrace, successTrace], performanceLayout);
         </script>
-    """
-    
-    # Add static image if exists
-    plot_path = Path('data/plots/feedback_evolution.png')
-    if plot_path.exists():
-        img_data = encode_image_base64(plot_path)
-        if img_data:
-            html += f"""
-        <div class="panel">
-            <h2>📊 Static Visualization</h2>
-            <div class="plot-container">
-                <img src="{img_data}" style="width: 100%; height: auto;" alt="Feedback Evolution">
-            </div>
-        </div>
-            """
-    
-    html += get_html_footer()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    """.encode('utf-8')
 
 
-def generate_complete_cbr_cycle_html(data, output_path):
-    """Genera HTML para test de complete CBR cycle."""
-    html = get_html_template("Complete CBR Cycle", has_plots=True)
+def generate_user_simulation_html(data, output_path, embed_images=False):
+    """Genera HTML para test de user simulation con plots interactivos."""
+    _write_html_stream(output_path, _user_simulation_fragments(data, output_path, embed_images))
     
-    html += """
-        <div class="header">
-            <h1>♻️ Complete CBR Cycle</h1>
-            <p class="subtitle">Full Cycle Testing: Retrieve → Reuse → Revise → Retain</p>
-        </div>
-    """
+    return output_path
+
+
+def _user_simulation_fragments(data, output_path, embed_images):
+    """Genera los fragmentos del reporte de user simulation en orden, sin acumular la página."""
+    yield USER_SIMULATION_PAGE_OPEN
     
-    summary = data['summary']
-    scenarios = data['scenarios']
+    params = data['parameters']
+    iterations = data['iterations']
     
-    html += f"""
+    # Calculate summary stats
+    feedback_scores = [it['avg_feedback_score'] for it in iterations]
+    cases_retained = [it['cases_retained'] for it in iterations]
+    success_rates = [it['success_rate'] for it in iterations]
+    avg_feedback = sum(feedback_scores) / len(iterations)
+    total_retained = sum(cases_retained)
+    avg_success_rate = sum(success_rates) / len(iterations)
+    
+    yield f"""
         <div class="panel">
-            <h2>📊 Overall Results</h2>
+            <h2>📊 Simulation Parameters & Results</h2>
             <div class="stats-grid">
                 <div class="stat-card">
-                    <div class="stat-label">Scenarios Executed</div>
-                    <div class="stat-value">{summary['scenarios_executed']}</div>
+                    <div class="stat-label">Concurrent Users</div>
+                    <div class="stat-value">{params['num_users']}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Initial Cases</div>
-                    <div class="stat-value">{summary['initial_cases']}</div>
+                    <div class="stat-label">Total Iterations</div>
+                    <div class="stat-value">{params['iterations']}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Cases Learned</div>
-                    <div class="stat-value positive">{summary['cases_learned']}</div>
+                    <div class="stat-label">Avg Feedback Score</div>
+                    <div class="stat-value positive">{avg_feedback:.2f}/5</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Final Cases</div>
-                    <div class="stat-value">{summary['final_cases']}</div>
+                    <div class="stat-label">Success Rate</div>
+                    <div class="stat-value positive">{avg_success_rate:.1%}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Avg Similarity</div>
-                    <div class="stat-value positive">{summary['avg_retrieval_similarity']:.2%}</div>
+                    <div class="stat-label">Total Cases Retained</div>
+                    <div class="stat-value">{total_retained}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Retention Rate</div>
-                    <div class="stat-value positive">{summary['retention_rate']:.1%}</div>
+                    <div class="stat-label">Final Case Count</div>
+                    <div class="stat-value">{iterations[-1]['current_case_count']}</div>
                 </div>
             </div>
         </div>
+    """
+    
+    # Interactive plots with Plotly
+    yield f"""
+        <div class="panel">
+            <h2>📈 Feedback Score Evolution</h2>
+            <div class="plot-container">
+                <div id="feedbackPlot"></div>
+            </div>
+        </div>
         
         <div class="panel">
-            <h2>📈 4R Cycle Performance</h2>
+            <h2>📦 Case Base Growth</h2>
             <div class="plot-container">
-                <div id="cyclePerformancePlot"></div>
+                <div id="caseGrowthPlot"></div>
             </div>
         </div>
         
         <div class="panel">
-            <h2>🎯 Quality Metrics by Scenario</h2>
+            <h2> Success Rate & Retention</h2>
             <div class="plot-container">
-                <div id="qualityMetricsPlot"></div>
+                <div id="performancePlot"></div>
             </div>
         </div>
         
         <script>
-            var scenarios = [];
-            var topSimilarity = [];
-            var avgSimilarity = [];
-            var culturalAdapt = [];
-            var feedbackScores = [];
+            // Prepare data
+            var iterations = {_to_json(_downsample([it['iteration'] for it in iterations]))};
+            var feedbackScores = {_js_float_array(_downsample(feedback_scores))};
+            var caseCounts = {_js_float_array(_downsample([it['current_case_count'] for it in iterations]))};
+            var casesRetained = {_js_float_array(_downsample(cases_retained))};
+            var successRates = {_js_float_array(_downsample([rate * 100 for rate in success_rates]))};
     """
     
-    for i, scenario in enumerate(scenarios, 1):
-        phases = scenario['phases']
-        html += f"""
-            scenarios.push('Scenario {i}');
-            topSimilarity.push({phases['retrieve']['top_similarity']});
-            avgSimilarity.push({phases['retrieve']['avg_similarity']});
-            culturalAdapt.push({phases['adapt']['cultural_adaptations']});
-            feedbackScores.push({phases['retain']['feedback_score']});
-        """
+    yield USER_SIMULATION_PLOTS_SCRIPT
+    
+    # Add static image if exists
+    yield from _image_panel(PLOTS_DIR / FEEDBACK_EVOLUTION_PNG, '📊 Static Visualization', 'Feedback Evolution', output_path, embed_images)
     
-    html += """
+    yield get_html_footer()
+
+
+# Partes estáticas del reporte de complete CBR cycle, pre-codificadas en UTF-8 al importar
+COMPLETE_CYCLE_PAGE_OPEN = (get_html_template("Complete CBR Cycle", has_plots=True) + """
+        <div class="header">
+            <h1>♻️ Complete CBR Cycle</h1>
+            <p class="subtitle">Full Cycle Testing: Retrieve → Reuse → Revise → Retain</p>
+        </div>
+    """).encode('utf-8')
+
+COMPLETE_CYCLE_PLOTS_SCRIPT = """
             // Cycle performance - Radar-like stacked bars
             var retrieveTrace = {
                 x: scenarios,
@@ -1059,7 +1359,7 @@ def generate_complete_cbr_cycle_html(data, output_path):
             
             var adaptTrace = {
                 x: scenarios,
-                y: culturalAdapt.map(v => v / 5), // Normalize to 0-1 scale
+                y: culturalAdaptNorm, // Normalizado a escala 0-1 en Python
                 name: 'Adapt Intensity',
                 type: 'bar',
                 marker: {color: '#f59e0b'}
@@ -1067,23 +1367,21 @@ def generate_complete_cbr_cycle_html(data, output_path):
             
             var feedbackTrace = {
                 x: scenarios,
-                y: feedbackScores.map(v => v / 5), // Normalize to 0-1 scale
+                y: feedbackNorm, // Normalizado a escala 0-1 en Python
                 name: 'Retain Quality',
                 type: 'bar',
                 marker: {color: '#e07a5f'}
             };
             
             var cycleLayout = {
+                ...BASE_LAYOUT,
                 title: '4R Cycle Phase Performance (Normalized)',
                 xaxis: {title: 'Scenario'},
                 yaxis: {title: 'Performance Score', range: [0, 1]},
-                barmode: 'group',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                barmode: 'group'
             };
             
-            Plotly.newPlot('cyclePerformancePlot', [retrieveTrace, adaptTrace, feedbackTrace], cycleLayout, {responsive: true});
+            regPlot('cyclePerformancePlot', [retrieveTrace, adaptTrace, feedbackTrace], cycleLayout);
             
             // Quality metrics - dual axis
             var simTrace = {
@@ -1109,6 +1407,7 @@ def generate_complete_cbr_cycle_html(data, output_path):
             };
             
             var qualityLayout = {
+                ...BASE_LAYOUT,
                 title: 'Similarity vs Feedback Across Scenarios',
                 xaxis: {title: 'Scenario'},
                 yaxis: {
@@ -1124,181 +1423,149 @@ def generate_complete_cbr_cycle_html(data, output_path):
                     overlaying: 'y',
                     side: 'right',
                     range: [0, 5]
-                },
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                }
             };
             
-            Plotly.newPlot('qualityMetricsPlot', [simTrace, feedbackLineTrace], qualityLayout, {responsive: true});
+            regPlot('qualityMetricsPlot', [simTrace, feedbackLineTrace], qualityLayout);
         </script>
-    """
-    
-    # Individual scenarios
-    for i, scenario in enumerate(scenarios, 1):
-        phases = scenario['phases']
-        html += f"""
+    """.encode('utf-8')
+
+
+# Panel de detalle de un escenario del ciclo CBR, con campos nombrados para `%` con un dict
+CYCLE_SCENARIO_PANEL = """
         <div class="panel">
-            <h2>Scenario {i}: {scenario['description']}</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">📥 Retrieved Cases</div>
-                    <div class="stat-value">{phases['retrieve']['cases_found']}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">🎯 Top Similarity</div>
-                    <div class="stat-value positive">{phases['retrieve']['top_similarity']:.2%}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">🔄 Menus Adapted</div>
-                    <div class="stat-value">{phases['adapt']['menus_adapted']}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label"> Valid Proposals</div>
-                    <div class="stat-value">{phases['revise']['valid_proposals']}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">💾 Retained</div>
-                    <div class="stat-value">{'✓' if phases['retain']['retained'] else '✗'}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">⭐ Feedback</div>
-                    <div class="stat-value positive">{phases['retain']['feedback_score']:.1f}/5</div>
-                </div>
-            </div>
+            <h2>Scenario %(i)d: %(description)s</h2>
+            %(stats)s
             <div class="alert info">
-                <strong>Retention Action:</strong> {phases['retain']['retention_action'].replace('_', ' ').title()}
+                <strong>Retention Action:</strong> %(retention_action)s
             </div>
         </div>
         """
-    
-    html += get_html_footer()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
 
 
-def generate_negative_cases_html(data, output_path):
-    """Genera HTML para test de negative cases."""
-    html = get_html_template("Negative Cases Learning", has_plots=True)
-    
-    html += """
-        <div class="header">
-            <h1>⚠ Negative Cases Learning</h1>
-            <p class="subtitle">Learning from Failures: Negative Case Management</p>
-        </div>
-    """
+def generate_complete_cbr_cycle_html(data, output_path):
+    """Genera HTML para test de complete CBR cycle (paginado si hay demasiados escenarios)."""
+    if len(data['scenarios']) > MAX_SCENARIOS_PER_FILE:
+        _write_paginated(output_path, "Complete CBR Cycle", data, _complete_cbr_cycle_fragments)
+    else:
+        _write_html_stream(output_path, _complete_cbr_cycle_fragments(data))
+        _remove_stale_parts(output_path)
+    
+    return output_path
+
+
+def _complete_cbr_cycle_fragments(data, first=1):
+    """Genera los fragmentos del reporte de complete CBR cycle en orden, sin acumular la página."""
+    yield COMPLETE_CYCLE_PAGE_OPEN
     
     summary = data['summary']
     scenarios = data['scenarios']
     
-    html += f"""
+    yield f"""
         <div class="panel">
-            <h2>📊 Summary Statistics</h2>
+            <h2>📊 Overall Results</h2>
             <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-label">Scenarios Executed</div>
+                    <div class="stat-value">{summary['scenarios_executed']}</div>
+                </div>
                 <div class="stat-card">
                     <div class="stat-label">Initial Cases</div>
-                    <div class="stat-value">{summary['initial_total_cases']}</div>
+                    <div class="stat-value">{summary['initial_cases']}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Cases Learned</div>
+                    <div class="stat-value positive">{summary['cases_learned']}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Final Cases</div>
-                    <div class="stat-value">{summary['final_total_cases']}</div>
+                    <div class="stat-value">{summary['final_cases']}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Negative Cases Created</div>
-                    <div class="stat-value warning">{summary.get('negative_cases_created', summary.get('negative_cases_added', 0))}</div>
+                    <div class="stat-label">Avg Similarity</div>
+                    <div class="stat-value positive">{summary['avg_retrieval_similarity']:.2%}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Patterns Tested</div>
-                    <div class="stat-value positive">{summary.get('negative_patterns_tested', 'N/A')}</div>
+                    <div class="stat-label">Retention Rate</div>
+                    <div class="stat-value positive">{summary['retention_rate']:.1%}</div>
                 </div>
             </div>
         </div>
         
         <div class="panel">
-            <h2>📈 Case Base Evolution</h2>
+            <h2>📈 4R Cycle Performance</h2>
             <div class="plot-container">
-                <div id="caseEvolutionPlot"></div>
+                <div id="cyclePerformancePlot" data-lazy="1" style="min-height: 450px;"></div>
             </div>
         </div>
         
         <div class="panel">
-            <h2>⚠ Feedback Distribution</h2>
+            <h2>🎯 Quality Metrics by Scenario</h2>
             <div class="plot-container">
-                <div id="feedbackDistPlot"></div>
+                <div id="qualityMetricsPlot" data-lazy="1" style="min-height: 450px;"></div>
             </div>
         </div>
         
-        <script>
-            // Case base evolution
-            var caseTypes = ['Positive/Neutral', 'Negative'];
-            var initialCounts = [{summary['initial_total_cases'] - summary['initial_negative_cases']}, {summary['initial_negative_cases']}];
-            var finalCounts = [{summary['final_total_cases'] - summary['final_negative_cases']}, {summary['final_negative_cases']}];
-            
-            var initialTrace = {{
-                x: caseTypes,
-                y: initialCounts,
-                name: 'Initial',
-                type: 'bar',
-                marker: {{color: '#5b6474'}}
-            }};
-            
-            var finalTrace = {{
-                x: caseTypes,
-                y: finalCounts,
-                name: 'Final',
-                type: 'bar',
-                marker: {{color: '#e07a5f'}}
-            }};
-            
-            var evolutionLayout = {{
-                title: 'Case Base Composition: Before vs After',
-                xaxis: {{title: 'Case Type'}},
-                yaxis: {{title: 'Number of Cases'}},
-                barmode: 'group',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {{family: '-apple-system, BlinkMacSystemFont, sans-serif'}}
-            }};
-            
-            Plotly.newPlot('caseEvolutionPlot', [initialTrace, finalTrace], evolutionLayout, {{responsive: true}});
-            
-            // Feedback distribution
-            var feedbackScenarios = [];
-            var feedbackValues = [];
-            var feedbackColors = [];
     """
     
-    for scenario in scenarios:
-        if 'feedback' in scenario:
-            feedback = scenario['feedback']
-            score = feedback['score']
-            scenario_name = scenario['scenario_id'].replace('_', ' ').title()
-            html += f"""
-            feedbackScenarios.push('{scenario_name}');
-            feedbackValues.push({score});
-            feedbackColors.push({score} > 3.5 ? '#059669' : {score} > 2.5 ? '#f59e0b' : '#dc2626');
-            """
+    # Todas las series en un bloque application/json parseado una vez (sin un push por escenario)
+    scenario_phases = [scenario['phases'] for scenario in scenarios]
+    yield _json_parse_vars(
+        'cycleData',
+        scenarios=[f'Scenario {i}' for i in range(first, first + len(scenario_phases))],
+        topSimilarity=[p['retrieve']['top_similarity'] for p in scenario_phases],
+        avgSimilarity=[p['retrieve']['avg_similarity'] for p in scenario_phases],
+        culturalAdaptNorm=[round(p['adapt']['cultural_adaptations'] / 5, 4) for p in scenario_phases],
+        feedbackScores=[p['retain']['feedback_score'] for p in scenario_phases],
+        feedbackNorm=[round(p['retain']['feedback_score'] / 5, 4) for p in scenario_phases],
+    )
+    
+    yield COMPLETE_CYCLE_PLOTS_SCRIPT
+    
+    # Individual scenarios
+    for i, scenario in enumerate(scenarios, first):
+        phases = scenario['phases']
+        yield CYCLE_SCENARIO_PANEL % {
+            'i': i,
+            'description': escape(scenario['description']),
+            'stats': _stat_cards([
+                ('📥 Retrieved Cases', phases['retrieve']['cases_found'], ''),
+                ('🎯 Top Similarity', f"{phases['retrieve']['top_similarity']:.2%}", 'positive'),
+                ('🔄 Menus Adapted', phases['adapt']['menus_adapted'], ''),
+                (' Valid Proposals', phases['revise']['valid_proposals'], ''),
+                ('💾 Retained', '✓' if phases['retain']['retained'] else '✗', ''),
+                ('⭐ Feedback', f"{phases['retain']['feedback_score']:.1f}/5", 'positive'),
+            ]),
+            'retention_action': escape(phases['retain']['retention_action'].replace('_', ' ').title()),
+        }
     
-    html += """
+    yield get_html_footer()
+
+
+# Partes estáticas del reporte de negative cases, pre-codificadas en UTF-8 al importar
+NEGATIVE_CASES_PAGE_OPEN = (get_html_template("Negative Cases Learning", has_plots=True) + """
+        <div class="header">
+            <h1>⚠ Negative Cases Learning</h1>
+            <p class="subtitle">Learning from Failures: Negative Case Management</p>
+        </div>
+    """).encode('utf-8')
+
+NEGATIVE_CASES_PLOTS_SCRIPT = """
+            // Feedback distribution
             var feedbackTrace = {
                 x: feedbackScenarios,
                 y: feedbackValues,
                 type: 'bar',
                 marker: {color: feedbackColors},
-                text: feedbackValues.map(v => v.toFixed(1) + '/5'),
+                text: feedbackLabels,
                 textposition: 'outside'
             };
             
             var feedbackLayout = {
+                ...BASE_LAYOUT,
                 title: 'Feedback Scores by Scenario',
                 xaxis: {title: 'Scenario'},
                 yaxis: {title: 'Feedback Score', range: [0, 5.5]},
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'},
                 shapes: [{
                     type: 'line',
                     x0: -0.5,
@@ -1321,44 +1588,140 @@ def generate_negative_cases_html(data, output_path):
                 }]
             };
             
-            Plotly.newPlot('feedbackDistPlot', [feedbackTrace], feedbackLayout, {responsive: true});
+            regPlot('feedbackDistPlot', [feedbackTrace], feedbackLayout);
+        </script>
+    """.encode('utf-8')
+
+
+# Construye en el navegador las filas de las tablas de avisos a partir de un
+# literal JSON por escenario (textContent: los case_id no se interpretan como HTML)
+NEGATIVE_WARNINGS_SCRIPT = """
+        <script>
+            function renderWarnings(id, rows) {
+                var fragment = document.createDocumentFragment();
+                rows.forEach(row => {
+                    var tr = document.createElement('tr');
+                    tr.innerHTML = '<td><code></code></td><td><span class="badge warning"></span></td><td><span class="badge warning"></span></td>';
+                    tr.querySelector('code').textContent = row[0];
+                    var badges = tr.querySelectorAll('.badge');
+                    badges[0].textContent = row[1];
+                    badges[1].textContent = row[2];
+                    fragment.appendChild(tr);
+                });
+                document.getElementById(id).appendChild(fragment);
+            }
         </script>
+""".encode('utf-8')
+
+
+def generate_negative_cases_html(data, output_path):
+    """Genera HTML para test de negative cases (paginado si hay demasiados escenarios)."""
+    if len(data['scenarios']) > MAX_SCENARIOS_PER_FILE:
+        _write_paginated(output_path, "Negative Cases Learning", data, _negative_cases_fragments)
+    else:
+        _write_html_stream(output_path, _negative_cases_fragments(data))
+        _remove_stale_parts(output_path)
+    
+    return output_path
+
+
+def _negative_cases_fragments(data, first=1):
+    """Genera los fragmentos del reporte de negative cases en orden, sin acumular la página."""
+    yield NEGATIVE_CASES_PAGE_OPEN
+    
+    summary = data['summary']
+    scenarios = data['scenarios']
+    S = _summary_ns(
+        summary,
+        negative_cases_created=summary.get('negative_cases_added', 0),
+        negative_patterns_tested='N/A'
+    )
+    
+    # Dos series de dos barras: se pre-renderiza como SVG (la distribución de feedback sigue en Plotly)
+    evolution_plot = _bar_chart_svg(
+        'Case Base Composition: Before vs After', ['Positive/Neutral', 'Negative'],
+        [[S.initial_total_cases - S.initial_negative_cases, S.initial_negative_cases],
+         [S.final_total_cases - S.final_negative_cases, S.final_negative_cases]],
+        ['#5b6474', '#e07a5f'], legend=['Initial', 'Final'],
+    )
+    
+    yield f"""
+        <div class="panel">
+            <h2>📊 Summary Statistics</h2>
+            <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-label">Initial Cases</div>
+                    <div class="stat-value">{S.initial_total_cases}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Final Cases</div>
+                    <div class="stat-value">{S.final_total_cases}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Negative Cases Created</div>
+                    <div class="stat-value warning">{S.negative_cases_created}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Patterns Tested</div>
+                    <div class="stat-value positive">{S.negative_patterns_tested}</div>
+                </div>
+            </div>
+        </div>
+        
+        <div class="panel">
+            <h2>📈 Case Base Evolution</h2>
+            <div class="plot-container">
+                {evolution_plot}
+            </div>
+        </div>
+        
+        <div class="panel">
+            <h2>⚠ Feedback Distribution</h2>
+            <div class="plot-container">
+                <div id="feedbackDistPlot" data-lazy="1" style="min-height: 450px;"></div>
+            </div>
+        </div>
+        
     """
     
+    rated = [scenario for scenario in scenarios if 'feedback' in scenario]
+    scores = [scenario['feedback']['score'] for scenario in rated]
+    yield _json_parse_vars(
+        'negativeData',
+        feedbackScenarios=[scenario['scenario_id'].replace('_', ' ').title() for scenario in rated],
+        feedbackValues=[round(score, 1) for score in scores],
+        feedbackLabels=[f'{score:.1f}/5' for score in scores],
+        feedbackColors=['#059669' if score > 3.5 else '#f59e0b' if score > 2.5 else '#dc2626' for score in scores],
+    )
+    
+    yield NEGATIVE_CASES_PLOTS_SCRIPT
+    yield NEGATIVE_WARNINGS_SCRIPT
+    
     # Scenarios
-    for i, scenario in enumerate(scenarios, 1):
-        html += f"""
+    for i, scenario in enumerate(scenarios, first):
+        yield f"""
         <div class="panel">
-            <h2>{scenario['scenario_id'].replace('_', ' ').title()}</h2>
+            <h2>{escape(scenario['scenario_id'].replace('_', ' ').title())}</h2>
             <div class="alert info">
-                {scenario['description']}
+                {escape(scenario['description'])}
             </div>
         """
         
         if 'feedback' in scenario:
             feedback = scenario['feedback']
-            html += f"""
+            yield f"""
             <h3>Feedback Results</h3>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">Score</div>
-                    <div class="stat-value {'positive' if feedback['score'] > 3.5 else 'warning'}">{feedback['score']:.1f}/5</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Success</div>
-                    <div class="stat-value">{'✓' if feedback['success'] else '✗'}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Retained</div>
-                    <div class="stat-value">{'✓' if feedback['retained'] else '✗'}</div>
-                </div>
-            </div>
+            {_stat_cards([
+                ('Score', f"{feedback['score']:.1f}/5", 'positive' if feedback['score'] > 3.5 else 'warning'),
+                ('Success', '✓' if feedback['success'] else '✗', ''),
+                ('Retained', '✓' if feedback['retained'] else '✗', ''),
+            ])}
             """
             if 'message' in feedback:
-                html += f'<div class="alert warning">{feedback["message"]}</div>'
+                yield f'<div class="alert warning">{escape(feedback["message"])}</div>'
         
         if 'warnings_found' in scenario and scenario['warnings_found'] > 0:
-            html += f"""
+            yield f"""
             <h3>⚠ Warnings Detected: {scenario['warnings_found']}</h3>
             <table class="comparison-table">
                 <thead>
@@ -1368,102 +1731,31 @@ def generate_negative_cases_html(data, output_path):
                         <th>Feedback Score</th>
                     </tr>
                 </thead>
-                <tbody>
-            """
-            for warning in scenario['warning_details']:
-                html += f"""
-                    <tr>
-                        <td><code>{warning['case_id']}</code></td>
-                        <td><span class="badge warning">{warning['similarity']:.2%}</span></td>
-                        <td><span class="badge warning">{warning['feedback_score']:.1f}/5</span></td>
-                    </tr>
-                """
-            html += """
-                </tbody>
+                <tbody id="warn{i}"></tbody>
             </table>
             """
+            # Filas como un único literal JSON (ya formateadas); las construye renderWarnings
+            rows = [
+                [str(warning['case_id']), f"{warning['similarity']:.2%}", f"{warning['feedback_score']:.1f}/5"]
+                for warning in scenario['warning_details']
+            ]
+            yield f'<script>renderWarnings("warn{i}", {_to_json(rows)});</script>\n'
+
         
-        html += "</div>"
-    
-    html += get_html_footer()
+        yield "</div>"
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    yield get_html_footer()
 
 
-def generate_semantic_cultural_html(data, output_path):
-    """Genera HTML para test de semantic cultural adaptation."""
-    html = get_html_template("Semantic Cultural Adaptation", has_plots=True)
-    
-    html += """
+# Partes estáticas del reporte de semantic cultural adaptation, pre-codificadas en UTF-8 al importar
+CULTURAL_PAGE_OPEN = (get_html_template("Semantic Cultural Adaptation", has_plots=True) + """
         <div class="header">
             <h1>🌍 Semantic Cultural Adaptation</h1>
             <p class="subtitle">Cross-Cultural Recipe Adaptation Analysis</p>
         </div>
-    """
-    
-    tests = data.get('test_cases', [])
-    summary = data.get('summary', {})
-    
-    html += f"""
-        <div class="panel">
-            <h2>📊 Summary Statistics</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">Cultures Tested</div>
-                    <div class="stat-value">{len(tests)}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Total Adaptations</div>
-                    <div class="stat-value">{summary.get('total_adaptations', 0)}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Avg Similarity</div>
-                    <div class="stat-value">{summary.get('avg_retrieval_similarity', 0):.3f}</div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="panel">
-            <h2>🎯 Retrieval Quality by Culture</h2>
-            <div class="plot-container">
-                <div id="retrievalQualityPlot"></div>
-            </div>
-        </div>
-        
-        <div class="panel">
-            <h2>🔧 Adaptation Intensity</h2>
-            <div class="plot-container">
-                <div id="adaptationPlot"></div>
-            </div>
-        </div>
-        
-        <script>
-            var cultures = [];
-            var topSim = [];
-            var avgSim = [];
-            var adaptations = [];
-            var substitutions = [];
-            var replacements = [];
-    """
-    
-    for test in tests:
-        culture = test.get('target_culture', 'unknown')
-        retrieval = test.get('retrieval', {})
-        adaptation = test.get('adaptation', {})
-        
-        html += f"""
-            cultures.push('{culture}');
-            topSim.push({retrieval.get('top_similarity', 0)});
-            avgSim.push({retrieval.get('avg_similarity', 0)});
-            adaptations.push({adaptation.get('cultural_adaptations_applied', 0)});
-            substitutions.push({adaptation.get('ingredient_substitutions', 0)});
-            replacements.push({adaptation.get('dish_replacements', 0)});
-        """
-    
-    html += """
+    """).encode('utf-8')
+
+CULTURAL_PLOTS_SCRIPT = """
             // Retrieval quality
             var topSimTrace = {
                 x: cultures,
@@ -1486,15 +1778,13 @@ def generate_semantic_cultural_html(data, output_path):
             };
             
             var retrievalLayout = {
+                ...BASE_LAYOUT,
                 title: 'Semantic Similarity in Retrieval Phase',
                 xaxis: {title: 'Target Culture'},
-                yaxis: {title: 'Similarity Score', range: [0, 1]},
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                yaxis: {title: 'Similarity Score', range: [0, 1]}
             };
             
-            Plotly.newPlot('retrievalQualityPlot', [topSimTrace, avgSimTrace], retrievalLayout, {responsive: true});
+            regPlot('retrievalQualityPlot', [topSimTrace, avgSimTrace], retrievalLayout);
             
             // Adaptation intensity
             var adaptTrace = {
@@ -1522,127 +1812,223 @@ def generate_semantic_cultural_html(data, output_path):
             };
             
             var adaptLayout = {
+                ...BASE_LAYOUT,
                 title: 'Adaptation Operations Applied',
                 xaxis: {title: 'Target Culture'},
                 yaxis: {title: 'Number of Operations'},
-                barmode: 'stack',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                barmode: 'stack'
             };
             
-            Plotly.newPlot('adaptationPlot', [adaptTrace, substTrace, replaceTrace], adaptLayout, {responsive: true});
+            regPlot('adaptationPlot', [adaptTrace, substTrace, replaceTrace], adaptLayout);
         </script>
-    """
-    
-    # Details per culture
-    for i, test in enumerate(tests, 1):
-        culture = test.get('target_culture', 'Unknown')
-        retrieval = test.get('retrieval', {})
-        adaptation = test.get('adaptation', {})
-        
-        html += f"""
-        <div class="panel">
-            <h2>{culture} Adaptation Details</h2>
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-label">Top Similarity</div>
-                    <div class="stat-value">{retrieval.get('top_similarity', 0):.3f}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Adaptations</div>
-                    <div class="stat-value">{adaptation.get('cultural_adaptations_applied', 0)}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Menu Price</div>
-                    <div class="stat-value">€{adaptation.get('total_price', 0):.2f}</div>
-                </div>
-            </div>
-        </div>
-        """
-    
-    html += get_html_footer()
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    print(f" Generated: {output_path}")
+    """.encode('utf-8')
 
 
-def generate_semantic_retain_html(data, output_path):
-    """Genera HTML para test de semantic retain."""
-    html = get_html_template("Semantic Retain", has_plots=True)
+def generate_semantic_cultural_html(data, output_path):
+    """Genera HTML para test de semantic cultural adaptation."""
+    _write_html_stream(output_path, _semantic_cultural_fragments(data))
     
-    html += """
-        <div class="header">
-            <h1>💾 Semantic Retain</h1>
-            <p class="subtitle">Case Base Retention and Update Strategies</p>
-        </div>
-    """
+    return output_path
+
+
+def _semantic_cultural_fragments(data):
+    """Genera los fragmentos del reporte de semantic cultural adaptation en orden, sin acumular la página."""
+    yield CULTURAL_PAGE_OPEN
     
     tests = data.get('test_cases', [])
-    summary = data.get('summary', {})
+    S = _summary_ns(data.get('summary', {}), total_adaptations=0, avg_retrieval_similarity=0)
     
-    html += f"""
+    yield f"""
         <div class="panel">
-            <h2>📊 Retention Summary</h2>
+            <h2>📊 Summary Statistics</h2>
             <div class="stats-grid">
                 <div class="stat-card">
-                    <div class="stat-label">Initial Cases</div>
-                    <div class="stat-value">{summary.get('initial_cases', 0)}</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-label">Final Cases</div>
-                    <div class="stat-value">{summary.get('final_cases', 0)}</div>
+                    <div class="stat-label">Cultures Tested</div>
+                    <div class="stat-value">{len(tests)}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Retention Rate</div>
-                    <div class="stat-value">{summary.get('retention_rate', 0)*100:.0f}%</div>
+                    <div class="stat-label">Total Adaptations</div>
+                    <div class="stat-value">{S.total_adaptations}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Cases Added</div>
-                    <div class="stat-value positive">+{summary.get('final_cases', 0) - summary.get('initial_cases', 0)}</div>
+                    <div class="stat-label">Avg Similarity</div>
+                    <div class="stat-value">{S.avg_retrieval_similarity:.3f}</div>
                 </div>
             </div>
         </div>
         
         <div class="panel">
-            <h2>🔄 Retention Actions Distribution</h2>
+            <h2>🎯 Retrieval Quality by Culture</h2>
             <div class="plot-container">
-                <div id="actionsPlot"></div>
+                <div id="retrievalQualityPlot" data-lazy="1" style="min-height: 450px;"></div>
             </div>
         </div>
         
         <div class="panel">
-            <h2>📈 Case Base Growth</h2>
+            <h2>🔧 Adaptation Intensity</h2>
             <div class="plot-container">
-                <div id="growthPlot"></div>
+                <div id="adaptationPlot" data-lazy="1" style="min-height: 450px;"></div>
             </div>
         </div>
         
-        <script>
-            var testNames = [];
-            var actions = [];
-            var actionColors = {{
-                'add_new': '#059669',
-                'update_existing': '#f59e0b',
-                'reject': '#dc2626'
-            }};
     """
     
+    retrievals = [test.get('retrieval', {}) for test in tests]
+    adaptations = [test.get('adaptation', {}) for test in tests]
+    yield _json_parse_vars(
+        'culturalData',
+        cultures=[test.get('target_culture', 'unknown') for test in tests],
+        topSim=[r.get('top_similarity', 0) for r in retrievals],
+        avgSim=[r.get('avg_similarity', 0) for r in retrievals],
+        adaptations=[a.get('cultural_adaptations_applied', 0) for a in adaptations],
+        substitutions=[a.get('ingredient_substitutions', 0) for a in adaptations],
+        replacements=[a.get('dish_replacements', 0) for a in adaptations],
+    )
+    
+    yield CULTURAL_PLOTS_SCRIPT
+    
+    # Details per culture
     for i, test in enumerate(tests, 1):
-        decision = test.get('decision', {})
-        action = decision.get('action', 'unknown')
-        html += f"""
-            testNames.push('Test {i}');
-            actions.push({{action: '{action}', color: actionColors['{action}'] || '#5b6474'}});
+        culture = test.get('target_culture', 'Unknown')
+        retrieval = test.get('retrieval', {})
+        adaptation = test.get('adaptation', {})
+        
+        yield f"""
+        <div class="panel">
+            <h2>{escape(culture)} Adaptation Details</h2>
+            {_stat_cards([
+                ('Top Similarity', f"{retrieval.get('top_similarity', 0):.3f}", ''),
+                ('Adaptations', adaptation.get('cultural_adaptations_applied', 0), ''),
+                ('Menu Price', f"€{adaptation.get('total_price', 0):.2f}", ''),
+            ])}
+        </div>
         """
     
-    html += """
+    yield get_html_footer()
+
+
+def _bar_chart_svg(title, labels, values, colors, width=600, height=400, legend=None):
+    """Renderiza un gráfico de barras simple como SVG inline (sin Plotly en el cliente); con `legend` agrupa una barra por serie (`values` y `colors` van por serie)."""
+    left, right, top, bottom = 60, 20, 50, 40
+    plot_w, plot_h = width - left - right, height - top - bottom
+    series = values if legend else [values]
+    peak = max((value for serie in series for value in serie), default=0) or 1
+    slot = plot_w / max(len(labels), 1)
+    bar_w = slot * 0.6 / len(series)
+    
+    items = []
+    for i, label in enumerate(labels):
+        for j, serie in enumerate(series):
+            value = serie[i]
+            bar_h = plot_h * value / peak * 0.9
+            x = left + i * slot + slot * 0.2 + j * bar_w
+            y = top + plot_h - bar_h
+            items.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_w:.1f}" height="{bar_h:.1f}" fill="{colors[j] if legend else colors[i]}"/>'
+                f'<text x="{x + bar_w / 2:.1f}" y="{y - 6:.1f}" text-anchor="middle">{value}</text>'
+            )
+        items.append(f'<text x="{left + (i + 0.5) * slot:.1f}" y="{top + plot_h + 20}" text-anchor="middle">{label}</text>')
+    
+    # Leyenda en una fila, alineada a la derecha bajo el título
+    for j, (name, color) in enumerate(zip(legend or (), colors)):
+        x = width - right - 100 * (len(legend) - j)
+        items.append(
+            f'<rect x="{x}" y="{top - 14}" width="12" height="12" fill="{color}"/>'
+            f'<text x="{x + 18}" y="{top - 4}">{name}</text>'
+        )
+    
+    return (
+        f'<svg viewBox="0 0 {width} {height}" width="100%" role="img" aria-label="{title}" '
+        f'style="background: #faf7f1; font-family: -apple-system, BlinkMacSystemFont, sans-serif; font-size: 13px;">'
+        f'<text x="{width / 2:.0f}" y="28" text-anchor="middle" font-size="17">{title}</text>'
+        f'<line x1="{left}" y1="{top + plot_h}" x2="{width - right}" y2="{top + plot_h}" stroke="#e1dacf"/>'
+        f'{"".join(items)}</svg>'
+    )
+
+
+def _pie_chart_svg(title, labels, values, colors, width=600, height=400):
+    """Renderiza un gráfico de tarta simple como SVG inline, con etiqueta y porcentaje por sector."""
+    cx, cy, r = width / 2, (height + 40) / 2, min(width, height - 40) / 2 - 50
+    total = sum(values) or 1
+    
+    items = []
+    angle = -math.pi / 2
+    for label, value, color in zip(labels, values, colors):
+        if not value:
+            continue
+        sweep = 2 * math.pi * value / total
+        if sweep >= 2 * math.pi - 1e-9:  # un único sector: el arco no puede cerrarse sobre sí mismo
+            items.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{r:.1f}" fill="{color}"/>')
+        else:
+            x1, y1 = cx + r * math.cos(angle), cy + r * math.sin(angle)
+            x2, y2 = cx + r * math.cos(angle + sweep), cy + r * math.sin(angle + sweep)
+            items.append(
+                f'<path d="M {cx:.1f} {cy:.1f} L {x1:.1f} {y1:.1f} A {r:.1f} {r:.1f} 0 {int(sweep > math.pi)} 1 {x2:.1f} {y2:.1f} Z" '
+                f'fill="{color}" stroke="#ffffff" stroke-width="2"/>'
+            )
+        mid = angle + sweep / 2
+        tx, ty = cx + (r + 18) * math.cos(mid), cy + (r + 18) * math.sin(mid)
+        anchor = 'start' if math.cos(mid) > 0.1 else 'end' if math.cos(mid) < -0.1 else 'middle'
+        items.append(f'<text x="{tx:.1f}" y="{ty + 4:.1f}" text-anchor="{anchor}">{label} {value / total:.1%}</text>')
+        angle += sweep
+    
+    return (
+        f'<svg viewBox="0 0 {width} {height}" width="100%" role="img" aria-label="{title}" '
+        f'style="background: #faf7f1; font-family: -apple-system, BlinkMacSystemFont, sans-serif; font-size: 13px;">'
+        f'<text x="{width / 2:.0f}" y="28" text-anchor="middle" font-size="17">{title}</text>'
+        f'{"".join(items)}</svg>'
+    )
+
+
+def _retain_test_panels(tests):
+    """Genera el panel HTML de cada test de retain (bucle caliente aislado del resto del reporte)."""
+    for i, test in enumerate(tests, 1):
+        decision = test.get('decision') or {}
+        action = decision.get('action', 'unknown')
+        retained = decision.get('retained', False)
+        
+        yield f"""
+        <div class="panel">
+            <h2>Test {i}: {escape(test.get('description', 'N/A'))}</h2>
+            {_stat_cards([
+                ('Culture', escape(test.get('menu_culture', 'N/A')), ''),
+                ('Action', escape(action.replace('_', ' ').title()), 'positive' if retained else 'warning'),
+                ('Retained', '✓' if retained else '✗', ''),
+            ])}
+            <div class="alert info">
+                <strong>Reason:</strong> {escape(decision.get('reason', 'N/A'))}
+            </div>
+        </div>
+        """
+
+
+# Partes estáticas del reporte de semantic retain, pre-codificadas en UTF-8 al importar
+RETAIN_PAGE_OPEN = (get_html_template("Semantic Retain", has_plots=True) + """
+        <div class="header">
+            <h1>💾 Semantic Retain</h1>
+            <p class="subtitle">Case Base Retention and Update Strategies</p>
+        </div>
+    """).encode('utf-8')
+
+# Sin gráficos interactivos ambos plots son SVG pre-renderizados: la página no carga Plotly
+RETAIN_STATIC_PAGE_OPEN = (get_html_template("Semantic Retain") + """
+        <div class="header">
+            <h1>💾 Semantic Retain</h1>
+            <p class="subtitle">Case Base Retention and Update Strategies</p>
+        </div>
+    """).encode('utf-8')
+
+RETAIN_ACTION_COLORS = {
+    'add_new': '#059669',
+    'update_existing': '#f59e0b',
+    'reject': '#dc2626',
+}
+
+RETAIN_PLOTS_SCRIPT = """
             // Actions pie chart
             var actionCounts = {};
-            actions.forEach(a => {
-                actionCounts[a.action] = (actionCounts[a.action] || 0) + 1;
+            actions.forEach(action => {
+                actionCounts[action] = (actionCounts[action] || 0) + 1;
             });
             
             var pieTrace = {
@@ -1650,87 +2036,177 @@ def generate_semantic_retain_html(data, output_path):
                 values: Object.values(actionCounts),
                 type: 'pie',
                 marker: {
-                    colors: Object.keys(actionCounts).map(k => actionColors[k])
+                    colors: Object.keys(actionCounts).map(k => actionColors[k] || '#5b6474')
                 },
                 textinfo: 'label+percent',
                 textposition: 'outside'
             };
             
             var pieLayout = {
-                title: 'Retention Strategy Distribution',
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {family: '-apple-system, BlinkMacSystemFont, sans-serif'}
+                ...BASE_LAYOUT,
+                title: 'Retention Strategy Distribution'
             };
             
-            Plotly.newPlot('actionsPlot', [pieTrace], pieLayout, {responsive: true});
-            
-            // Growth visualization
-    """
-    
-    initial = summary.get('initial_cases', 0)
-    final = summary.get('final_cases', 0)
+            regPlot('actionsPlot', [pieTrace], pieLayout);
+    """.encode('utf-8')
+
+
+def generate_semantic_retain_html(data, output_path, interactive=False):
+    """Genera HTML para test de semantic retain (`interactive` dibuja el crecimiento con Plotly)."""
+    _write_html_stream(output_path, _semantic_retain_fragments(data, interactive))
     
-    html += f"""
-            var growthTrace = {{
-                x: ['Initial', 'Final'],
-                y: [{initial}, {final}],
-                type: 'bar',
-                marker: {{
-                    color: ['#5b6474', '#0f766e']
-                }},
-                text: [{initial}, {final}],
-                textposition: 'outside'
-            }};
-            
-            var growthLayout = {{
-                title: 'Case Base Size Evolution',
-                xaxis: {{title: 'State'}},
-                yaxis: {{title: 'Number of Cases'}},
-                plot_bgcolor: '#faf7f1',
-                paper_bgcolor: '#ffffff',
-                font: {{family: '-apple-system, BlinkMacSystemFont, sans-serif'}}
-            }};
-            
-            Plotly.newPlot('growthPlot', [growthTrace], growthLayout, {{responsive: true}});
-        </script>
-    """
+    return output_path
+
+
+def _semantic_retain_fragments(data, interactive):
+    """Genera los fragmentos del reporte de semantic retain en orden, sin acumular la página."""
+    yield RETAIN_PAGE_OPEN if interactive else RETAIN_STATIC_PAGE_OPEN
     
-    # Individual test details
-    for i, test in enumerate(tests, 1):
-        decision = test.get('decision', {})
-        action = decision.get('action', 'unknown')
-        retained = decision.get('retained', False)
-        
-        html += f"""
+    tests = data.get('test_cases', [])
+    S = _summary_ns(data.get('summary', {}), initial_cases=0, final_cases=0, retention_rate=0)
+    initial = S.initial_cases
+    final = S.final_cases
+    
+    # Tarta de pocas acciones y dos barras estáticas: por defecto se pre-renderizan como SVG
+    if interactive:
+        actions_plot = '<div id="actionsPlot" data-lazy="1" style="min-height: 450px;"></div>'
+        growth_plot = '<div id="growthPlot" data-lazy="1" style="min-height: 450px;"></div>'
+    else:
+        action_counts = {}
+        for test in tests:
+            action = (test.get('decision') or {}).get('action', 'unknown')
+            action_counts[action] = action_counts.get(action, 0) + 1
+        actions_plot = _pie_chart_svg('Retention Strategy Distribution',
+                                      [escape(action.replace('_', ' ', 1).upper()) for action in action_counts],
+                                      list(action_counts.values()),
+                                      [RETAIN_ACTION_COLORS.get(action, '#5b6474') for action in action_counts])
+        growth_plot = _bar_chart_svg('Case Base Size Evolution', ['Initial', 'Final'],
+                                     [initial, final], ['#5b6474', '#0f766e'])
+    
+    yield f"""
         <div class="panel">
-            <h2>Test {i}: {test.get('description', 'N/A')}</h2>
+            <h2>📊 Retention Summary</h2>
             <div class="stats-grid">
                 <div class="stat-card">
-                    <div class="stat-label">Culture</div>
-                    <div class="stat-value">{test.get('menu_culture', 'N/A')}</div>
+                    <div class="stat-label">Initial Cases</div>
+                    <div class="stat-value">{S.initial_cases}</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-label">Final Cases</div>
+                    <div class="stat-value">{S.final_cases}</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Action</div>
-                    <div class="stat-value {'positive' if retained else 'warning'}">{action.replace('_', ' ').title()}</div>
+                    <div class="stat-label">Retention Rate</div>
+                    <div class="stat-value">{S.retention_rate*100:.0f}%</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-label">Retained</div>
-                    <div class="stat-value">{'✓' if retained else '✗'}</div>
+                    <div class="stat-label">Cases Added</div>
+                    <div class="stat-value positive">+{S.final_cases - S.initial_cases}</div>
                 </div>
             </div>
-            <div class="alert info">
-                <strong>Reason:</strong> {decision.get('reason', 'N/A')}
+        </div>
+        
+        <div class="panel">
+            <h2>🔄 Retention Actions Distribution</h2>
+            <div class="plot-container">
+                {actions_plot}
             </div>
         </div>
-        """
+        
+        <div class="panel">
+            <h2>📈 Case Base Growth</h2>
+            <div class="plot-container">
+                {growth_plot}
+            </div>
+        </div>
+    """
     
-    html += get_html_footer()
+    if interactive:
+        # Acciones de todos los tests en un único bloque JSON (sin un push por test)
+        yield _json_parse_vars(
+            'retainData',
+            actions=[(test.get('decision') or {}).get('action', 'unknown') for test in tests],
+            actionColors=RETAIN_ACTION_COLORS,
+        )
+        
+        yield RETAIN_PLOTS_SCRIPT
+        
+        growth_trace = {
+            'x': ['Initial', 'Final'],
+            'y': [initial, final],
+            'type': 'bar',
+            'marker': {'color': ['#5b6474', '#0f766e']},
+            'text': [initial, final],
+            'textposition': 'outside',
+        }
+        growth_layout = {
+            'title': 'Case Base Size Evolution',
+            'xaxis': {'title': 'State'},
+            'yaxis': {'title': 'Number of Cases'},
+        }
+        yield f"""
+            // Growth visualization (trace y layout serializados una vez en Python)
+            var growthTrace = {_to_json(growth_trace)};
+            var growthLayout = {{...BASE_LAYOUT, ...{_to_json(growth_layout)}}};
+            
+            regPlot('growthPlot', [growthTrace], growthLayout);
+        </script>
+    """
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    # Individual test details
+    yield from _retain_test_panels(tests)
     
-    print(f" Generated: {output_path}")
+    yield get_html_footer()
+
+
+# Tarjetas del índice agrupadas por categoría: (título, [(href, icono, nombre, descripción), ...])
+INDEX_CATEGORIES = [
+    ('🎯 Learning & Adaptation', [
+        ('report_adaptive_weights.html', '⚖️', 'Adaptive Weights', 'Static vs Adaptive weight learning comparison with performance metrics'),
+        ('report_adaptive_learning.html', '📈', 'Adaptive Learning', 'Learning system performance: precision, satisfaction, and time overhead'),
+        ('report_user_simulation.html', '👥', 'User Simulation', 'Multi-user interactions with feedback evolution and retention analysis'),
+    ]),
+    ('🔄 CBR Cycle', [
+        ('report_complete_cbr_cycle.html', '♻️', 'Complete CBR Cycle', 'Full 4R cycle (Retrieve, Reuse, Revise, Retain) across scenarios'),
+        ('report_semantic_retrieve.html', '🔍', 'Semantic Retrieve', 'Case retrieval with similarity scores and rankings'),
+        ('report_semantic_retain.html', '💾', 'Semantic Retain', 'Case retention strategies and learning integration'),
+    ]),
+    ('🌍 Cultural & Edge Cases', [
+        ('report_semantic_cultural_adaptation.html', '🌏', 'Cultural Adaptation', 'Cross-cultural recipe adaptations and ingredient substitutions'),
+        ('report_negative_cases.html', '⚠', 'Negative Cases', 'Failure learning and negative feedback handling'),
+        ('report_dietary_restrictions.html', '🥗', 'Dietary Restrictions', 'Testing all 33 dietary restrictions with 100% compliance validation'),
+        ('report_adaptation_strategies.html', '🔧', 'Adaptation Strategies', 'Quantifying ADAPT phase: ingredient substitution vs dish replacement'),
+    ]),
+]
+
+INDEX_CATEGORY = """        <div class="category">
+            <h2>{title}</h2>
+            <div class="reports-grid">
+{cards}
+            </div>
+        </div>
+"""
+
+INDEX_CARD = """                <a href="{href}" class="report-card">
+                    <span class="icon">{icon}</span>
+                    <h2>{name}</h2>
+                    <p>{description}</p>
+                </a>
+"""
+
+
+def _index_categories():
+    """Renderiza las categorías del índice a partir de INDEX_CATEGORIES."""
+    return "        \n".join(
+        INDEX_CATEGORY.format(
+            title=title,
+            cards="                \n".join(
+                INDEX_CARD.format(href=href, icon=icon, name=name, description=description)
+                for href, icon, name, description in cards
+            ).rstrip("\n"),
+        )
+        for title, cards in INDEX_CATEGORIES
+    )
 
 
 def generate_index_html(htmls_dir):
@@ -1844,101 +2320,91 @@ def generate_index_html(htmls_dir):
             <p class="subtitle">Interactive Visual Reports for Case-Based Reasoning System</p>
         </header>
         
-        <div class="category">
-            <h2>🎯 Learning & Adaptation</h2>
-            <div class="reports-grid">
-                <a href="report_adaptive_weights.html" class="report-card">
-                    <span class="icon">⚖️</span>
-                    <h2>Adaptive Weights</h2>
-                    <p>Static vs Adaptive weight learning comparison with performance metrics</p>
-                </a>
-                
-                <a href="report_adaptive_learning.html" class="report-card">
-                    <span class="icon">📈</span>
-                    <h2>Adaptive Learning</h2>
-                    <p>Learning system performance: precision, satisfaction, and time overhead</p>
-                </a>
-                
-                <a href="report_user_simulation.html" class="report-card">
-                    <span class="icon">👥</span>
-                    <h2>User Simulation</h2>
-                    <p>Multi-user interactions with feedback evolution and retention analysis</p>
-                </a>
-            </div>
-        </div>
-        
-        <div class="category">
-            <h2>🔄 CBR Cycle</h2>
-            <div class="reports-grid">
-                <a href="report_complete_cbr_cycle.html" class="report-card">
-                    <span class="icon">♻️</span>
-                    <h2>Complete CBR Cycle</h2>
-                    <p>Full 4R cycle (Retrieve, Reuse, Revise, Retain) across scenarios</p>
-                </a>
-                
-                <a href="report_semantic_retrieve.html" class="report-card">
-                    <span class="icon">🔍</span>
-                    <h2>Semantic Retrieve</h2>
-                    <p>Case retrieval with similarity scores and rankings</p>
-                </a>
-                
-                <a href="report_semantic_retain.html" class="report-card">
-                    <span class="icon">💾</span>
-                    <h2>Semantic Retain</h2>
-                    <p>Case retention strategies and learning integration</p>
-                </a>
-            </div>
-        </div>
-        
-        <div class="category">
-            <h2>🌍 Cultural & Edge Cases</h2>
-            <div class="reports-grid">
-                <a href="report_semantic_cultural_adaptation.html" class="report-card">
-                    <span class="icon">🌏</span>
-                    <h2>Cultural Adaptation</h2>
-                    <p>Cross-cultural recipe adaptations and ingredient substitutions</p>
-                </a>
-                
-                <a href="report_negative_cases.html" class="report-card">
-                    <span class="icon">⚠</span>
-                    <h2>Negative Cases</h2>
-                    <p>Failure learning and negative feedback handling</p>
-                </a>
-                
-                <a href="report_dietary_restrictions.html" class="report-card">
-                    <span class="icon">🥗</span>
-                    <h2>Dietary Restrictions</h2>
-                    <p>Testing all 33 dietary restrictions with 100% compliance validation</p>
-                </a>
-                
-                <a href="report_adaptation_strategies.html" class="report-card">
-                    <span class="icon">🔧</span>
-                    <h2>Adaptation Strategies</h2>
-                    <p>Quantifying ADAPT phase: ingredient substitution vs dish replacement</p>
-                </a>
-            </div>
-        </div>
-    </div>
+""" + _index_categories() + """    </div>
 </body>
 </html>
 """
     
-    with open(htmls_dir / 'index.html', 'w', encoding='utf-8') as f:
-        f.write(html)
+    _write_html(htmls_dir / 'index.html', html)
+
+
+# Cabecera (solo <head> con estilos) del template base
+DIETARY_HEAD = get_html_head("Dietary Restrictions Test")
+
+# (clase CSS, texto) del estado de un caso extremo según si generó menús
+EXTREME_STATUS = {True: ('positive', '✅ Success'), False: ('negative', '❌ No menus')}
+
+
+# Clases CSS por tramo de tasa: por debajo de `fair`, entre `fair` y `good`, y desde `good`
+RATE_CLASSES = ('negative', 'warning', 'positive')
+
+
+def _rate_class(rate, good, fair):
+    """Clase CSS de una tasa en porcentaje según los umbrales `good` y `fair`."""
+    return RATE_CLASSES[bisect_right((fair, good), rate)]
+
+
+# Filas del reporte dietético como f-strings compiladas: los trozos literales van en el
+# bytecode y no se vuelve a analizar una plantilla con `str.format` en cada fila
+def _dietary_individual_row(test, rate):
+    """Fila de la tabla de restricciones individuales."""
+    return f"""
+                    <tr>
+                        <td><strong>{escape(test['restriction'])}</strong></td>
+                        <td><span class="badge">{escape(test['category'])}</span></td>
+                        <td>{test['menus_generated']}</td>
+                        <td>{test['compliant_menus']}</td>
+                        <td class="{_rate_class(rate, 80, 60)}">{rate:.0f}%</td>
+                        <td>{test['avg_adaptation_score']:.3f}</td>
+                    </tr>
+"""
+
+
+def _dietary_dual_row(test, rate):
+    """Fila de la tabla de pares de restricciones."""
+    return f"""
+                    <tr>
+                        <td><strong>{escape(' + '.join(test['restrictions']))}</strong></td>
+                        <td>{escape(', '.join(set(test['categories'])))}</td>
+                        <td>{test['menus_generated']}</td>
+                        <td class="{_rate_class(rate, 70, 50)}">{rate:.0f}%</td>
+                    </tr>
+"""
+
+
+def _dietary_extreme_row(test):
+    """Fila de la tabla de casos extremos (3+ restricciones)."""
+    status_class, status_text = EXTREME_STATUS[test['menus_generated'] > 0]
+    return f"""
+                    <tr>
+                        <td>{escape(', '.join(test['restrictions']))}</td>
+                        <td>{test['num_restrictions']}</td>
+                        <td>{test['menus_generated']}</td>
+                        <td class="{status_class}"><strong>{status_text}</strong></td>
+                    </tr>
+"""
 
 
 def generate_dietary_restrictions_html(data, output_path):
     """Genera reporte HTML para test de restricciones dietéticas."""
-    summary = data.get('summary', {})
+    _write_html_stream(output_path, _dietary_fragments(data))
+    return output_path
+
+
+def _dietary_fragments(data):
+    """Genera los fragmentos del reporte dietético en orden, sin acumular la página."""
+    S = _summary_ns(
+        data.get('summary', {}),
+        individual_restrictions_tested=0,
+        individual_compliance_rate=0,
+        dual_compliance_rate=0,
+        extreme_success_rate=0,
+    )
     individual_tests = data.get('individual_tests', [])
     combination_tests = data.get('combination_tests', [])
     extreme_tests = data.get('extreme_tests', [])
     
-    # Usar el template base
-    base_template = get_html_template("Dietary Restrictions Test", has_plots=False)
-    
-    # Extraer solo la parte de styles del template
-    html = base_template.split('</head>')[0] + """
+    yield DIETARY_HEAD + f"""
 </head>
 <body>
     <div class="container">
@@ -1950,19 +2416,19 @@ def generate_dietary_restrictions_html(data, output_path):
             <div class="stats-grid">
                 <div class="stat-card">
                     <div class="stat-label">Restrictions Tested</div>
-                    <div class="stat-value">{}</div>
+                    <div class="stat-value">{S.individual_restrictions_tested}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Individual Compliance</div>
-                    <div class="stat-value positive">{}%</div>
+                    <div class="stat-value positive">{int(S.individual_compliance_rate*100)}%</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Dual Compliance</div>
-                    <div class="stat-value warning">{}%</div>
+                    <div class="stat-value warning">{int(S.dual_compliance_rate*100)}%</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Extreme Success</div>
-                    <div class="stat-value">{}%</div>
+                    <div class="stat-value">{int(S.extreme_success_rate*100)}%</div>
                 </div>
             </div>
         </div>
@@ -1981,30 +2447,11 @@ def generate_dietary_restrictions_html(data, output_path):
                     </tr>
                 </thead>
                 <tbody>
-""".format(
-        summary.get('individual_restrictions_tested', 0),
-        int(summary.get('individual_compliance_rate', 0)*100),
-        int(summary.get('dual_compliance_rate', 0)*100),
-        int(summary.get('extreme_success_rate', 0)*100)
-    )
+"""
     
-    for test in individual_tests:
-        compliance_rate = test['compliance_rate'] * 100
-        status_class = 'positive' if compliance_rate >= 80 else 'warning' if compliance_rate >= 60 else 'negative'
-        html += """
-                    <tr>
-                        <td><strong>{}</strong></td>
-                        <td><span class="badge">{}</span></td>
-                        <td>{}</td>
-                        <td>{}</td>
-                        <td class="{}">{:.0f}%</td>
-                        <td>{:.3f}</td>
-                    </tr>
-""".format(test['restriction'], test['category'], test['menus_generated'], 
-           test['compliant_menus'], status_class, compliance_rate, 
-           test['avg_adaptation_score'])
+    yield from (_dietary_individual_row(test, test['compliance_rate'] * 100) for test in individual_tests)
     
-    html += """
+    yield """
                 </tbody>
             </table>
         </div>
@@ -2023,21 +2470,9 @@ def generate_dietary_restrictions_html(data, output_path):
                 <tbody>
 """
     
-    for test in combination_tests:
-        compliance_rate = test['compliance_rate'] * 100
-        status_class = 'positive' if compliance_rate >= 70 else 'warning' if compliance_rate >= 50 else 'negative'
-        restrictions_str = ' + '.join(test['restrictions'])
-        categories_str = ', '.join(set(test['categories']))
-        html += """
-                    <tr>
-                        <td><strong>{}</strong></td>
-                        <td>{}</td>
-                        <td>{}</td>
-                        <td class="{}">{:.0f}%</td>
-                    </tr>
-""".format(restrictions_str, categories_str, test['menus_generated'], status_class, compliance_rate)
+    yield from (_dietary_dual_row(test, test['compliance_rate'] * 100) for test in combination_tests)
     
-    html += """
+    yield """
                 </tbody>
             </table>
         </div>
@@ -2056,20 +2491,9 @@ def generate_dietary_restrictions_html(data, output_path):
                 <tbody>
 """
     
-    for test in extreme_tests:
-        restrictions_str = ', '.join(test['restrictions'])
-        status = '✅ Success' if test['menus_generated'] > 0 else '❌ No menus'
-        status_class = 'positive' if test['menus_generated'] > 0 else 'negative'
-        html += """
-                    <tr>
-                        <td>{}</td>
-                        <td>{}</td>
-                        <td>{}</td>
-                        <td class="{}"><strong>{}</strong></td>
-                    </tr>
-""".format(restrictions_str, test['num_restrictions'], test['menus_generated'], status_class, status)
+    yield from (_dietary_extreme_row(test) for test in extreme_tests)
     
-    html += """
+    yield f"""
                 </tbody>
             </table>
         </div>
@@ -2101,126 +2525,204 @@ def generate_dietary_restrictions_html(data, output_path):
             </div>
         </div>
         
-        <div class="timestamp">Generated: {}</div>
+        <div class="timestamp">Generated: {escape(str(data.get('timestamp', 'N/A')))}</div>
     </div>
 </body>
 </html>
-""".format(data.get('timestamp', 'N/A'))
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+"""
+
+
+# Tipos de conflicto del reporte de adaptación: (clave, título de la tabla)
+CONFLICT_TYPES = (('cultural', 'Cultural Conflicts'), ('dietary', 'Dietary Conflicts'), ('mixed', 'Mixed Conflicts'))
+
+@dataclass(slots=True)
+class ConflictStats:
+    """Estadísticas de nivel 1/2 de un tipo de conflicto (campos con valor 0 si la lista está vacía)."""
+    level_1_cases: int = 0
+    level_1_pct: float = 0.0
+    avg_ingredients_level_1: float = 0.0
+    avg_dishes_level_1: float = 0.0
+    level_2_cases: int = 0
+    level_2_pct: float = 0.0
+    avg_ingredients_level_2: float = 0.0
+    avg_dishes_level_2: float = 0.0
+    similarity_improvement: float = 0.0
+
+
+# Estadísticas compartidas cuando no hay datos de conflictos
+EMPTY_CONFLICT_STATS = ConflictStats()
+
+
+# Tabla de nivel 1/2 de un tipo de conflicto; `s` es un ConflictStats
+CONFLICT_TABLE = """<h3 style="color: var(--accent); margin: 16px 0 8px;">{title}</h3>
+            <table class="metrics-table">
+                <thead>
+                    <tr><th>Strategy</th><th>Cases</th><th>%</th><th>Avg Ingr. Subs</th><th>Avg Dishes Changed</th><th>Similarity Improvement</th></tr>
+                </thead>
+                <tbody>
+                    <tr>
+                        <td>Level 1 (ingredients)</td>
+                        <td>{s.level_1_cases}</td>
+                        <td>{s.level_1_pct:.1f}%</td>
+                        <td>{s.avg_ingredients_level_1:.2f}</td>
+                        <td>{s.avg_dishes_level_1:.2f}</td>
+                        <td class="accent">+{s.similarity_improvement:.3f}</td>
+                    </tr>
+                    <tr>
+                        <td>Level 2 (dishes)</td>
+                        <td>{s.level_2_cases}</td>
+                        <td>{s.level_2_pct:.1f}%</td>
+                        <td>{s.avg_ingredients_level_2:.2f}</td>
+                        <td>{s.avg_dishes_level_2:.2f}</td>
+                        <td class="accent">+{s.similarity_improvement:.3f}</td>
+                    </tr>
+                </tbody>
+            </table>"""
+
+
+def _conflict_table(title, stats):
+    """Tabla de nivel 1/2 para un tipo de conflicto (cultural, dietético o mixto)."""
+    return CONFLICT_TABLE.format(title=title, s=stats)
+
+
+# Claves de primer nivel del JSON de adaptación y sus valores por defecto
+ADAPTATION_DATA_DEFAULTS = {
+    'summary': {},
+    'cultural_conflicts': [],
+    'dietary_conflicts': [],
+    'mixed_conflicts': [],
+    'timestamp': 'N/A',
+}
+
+# Campos del resumen de adaptación y sus valores por defecto
+ADAPTATION_SUMMARY_DEFAULTS = {
+    'total_cases': 0,
+    'level_0_no_adaptation': 0,
+    'level_0_pct': 0.0,
+    'level_1_ingredient_substitution': 0,
+    'level_1_pct': 0.0,
+    'level_2_dish_replacement': 0,
+    'level_2_pct': 0.0,
+    'level_3_case_rejection': 0,
+    'level_3_pct': 0.0,
+    'total_ingredients_substituted': 0,
+    'avg_ingredients_per_case': 0.0,
+    'total_dishes_replaced': 0,
+    'avg_dishes_per_case': 0.0,
+    'avg_similarity_before': 0.0,
+    'avg_similarity_after': 0.0,
+    'similarity_improvement': 0.0,
+    'similarity_improvement_pct': 0.0,
+    'success_rate': 0.0,
+}
+
+
+# Partes estáticas del reporte de adaptación, pre-codificadas en UTF-8 al importar
+ADAPTATION_PAGE_OPEN = (get_html_head("Adaptation Strategies Test") + """
+</head>
+<body>
+    <div class="container">
+        <h1>🔧 Adaptation Strategies Analysis</h1>
+        <p class="subtitle">Quantifying ADAPT phase behavior: ingredient substitution vs dish replacement</p>
+        """).encode('utf-8')
+
+ADAPTATION_VISUALIZATION = """        
+        <div class="panel">
+            <h2>📊 Visualization</h2>
+            <div class="plot-container">
+                <img src="../plots/adaptation_strategies_breakdown.png" alt="Adaptation Strategies" style="max-width: 100%; height: auto;">
+            </div>
+        </div>
+""".encode('utf-8')
+
+ADAPTATION_PAGE_CLOSE = b"""    </div>
+</body>
+</html>
+"""
 
 
 def generate_adaptation_strategies_html(data, output_path):
     """Genera reporte HTML para test de estrategias de adaptación."""
-    summary = data.get('summary', {})
-    
-    # Extract strategy distribution from summary
-    strategy_distribution = {
-        'level_0': summary.get('level_0_no_adaptation', 0),
-        'level_0_pct': summary.get('level_0_pct', 0.0),
-        'level_1': summary.get('level_1_ingredient_substitution', 0),
-        'level_1_pct': summary.get('level_1_pct', 0.0),
-        'level_2': summary.get('level_2_dish_replacement', 0),
-        'level_2_pct': summary.get('level_2_pct', 0.0),
-        'level_3': summary.get('level_3_case_rejection', 0),
-        'level_3_pct': summary.get('level_3_pct', 0.0),
-    }
-    
-    # Extract granularity
-    granularity = {
-        'total_ingredients_substituted': summary.get('total_ingredients_substituted', 0),
-        'avg_ingredients_per_case': summary.get('avg_ingredients_per_case', 0.0),
-        'total_dishes_replaced': summary.get('total_dishes_replaced', 0),
-        'avg_dishes_per_case': summary.get('avg_dishes_per_case', 0.0),
-    }
-    
-    # Extract effectiveness
-    effectiveness = {
-        'avg_similarity_before': summary.get('avg_similarity_before', 0.0),
-        'avg_similarity_after': summary.get('avg_similarity_after', 0.0),
-        'similarity_improvement': summary.get('similarity_improvement', 0.0),
-        'similarity_improvement_pct': summary.get('similarity_improvement_pct', 0.0),
-        'success_rate': summary.get('success_rate', 0.0),
-    }
-    
-    # Extract by_conflict_type (may not exist in current JSON)
-    by_conflict_type = {
-        'cultural': {
-            'level_1_cases': 0, 'level_1_pct': 0.0, 'avg_ingredients_level_1': 0.0, 
-            'avg_dishes_level_1': 0.0, 'level_2_cases': 0, 'level_2_pct': 0.0,
-            'avg_ingredients_level_2': 0.0, 'avg_dishes_level_2': 0.0, 'similarity_improvement': 0.0
-        },
-        'dietary': {
-            'level_1_cases': 0, 'level_1_pct': 0.0, 'avg_ingredients_level_1': 0.0,
-            'avg_dishes_level_1': 0.0, 'level_2_cases': 0, 'level_2_pct': 0.0,
-            'avg_ingredients_level_2': 0.0, 'avg_dishes_level_2': 0.0, 'similarity_improvement': 0.0
-        },
-        'mixed': {
-            'level_1_cases': 0, 'level_1_pct': 0.0, 'avg_ingredients_level_1': 0.0,
-            'avg_dishes_level_1': 0.0, 'level_2_cases': 0, 'level_2_pct': 0.0,
-            'avg_ingredients_level_2': 0.0, 'avg_dishes_level_2': 0.0, 'similarity_improvement': 0.0
-        }
-    }
+    # Los valores por defecto se aplican una vez al principio; después, acceso directo
+    data = {**ADAPTATION_DATA_DEFAULTS, **data}
+    S = _summary_ns(data['summary'], **ADAPTATION_SUMMARY_DEFAULTS)
     
     # Calculate from detailed results if available
-    cultural_conflicts = data.get('cultural_conflicts', [])
-    dietary_conflicts = data.get('dietary_conflicts', [])
-    mixed_conflicts = data.get('mixed_conflicts', [])
-    
-    for conflict_list, conflict_key in [(cultural_conflicts, 'cultural'), 
-                                         (dietary_conflicts, 'dietary'), 
-                                         (mixed_conflicts, 'mixed')]:
-        level_1_items = [c for c in conflict_list if c.get('adaptation_level') == 1]
-        level_2_items = [c for c in conflict_list if c.get('adaptation_level') == 2]
-        total = len(conflict_list)
-        
-        if total > 0:
-            by_conflict_type[conflict_key]['level_1_cases'] = len(level_1_items)
-            by_conflict_type[conflict_key]['level_1_pct'] = (len(level_1_items) / total) * 100
-            by_conflict_type[conflict_key]['level_2_cases'] = len(level_2_items)
-            by_conflict_type[conflict_key]['level_2_pct'] = (len(level_2_items) / total) * 100
-            
-            if level_1_items:
-                by_conflict_type[conflict_key]['avg_ingredients_level_1'] = sum(c.get('ingredients_substituted', 0) for c in level_1_items) / len(level_1_items)
-                by_conflict_type[conflict_key]['avg_dishes_level_1'] = sum(c.get('dishes_replaced', 0) for c in level_1_items) / len(level_1_items)
+    cultural_conflicts = data['cultural_conflicts']
+    dietary_conflicts = data['dietary_conflicts']
+    mixed_conflicts = data['mixed_conflicts']
+    
+    # Extract by_conflict_type (may not exist in current JSON): sin conflictos no se agrega nada
+    by_conflict_type = {}
+    if cultural_conflicts or dietary_conflicts or mixed_conflicts:
+        by_conflict_type = {key: ConflictStats() for key in ('cultural', 'dietary', 'mixed')}
+        
+        for conflict_list, conflict_key in [(cultural_conflicts, 'cultural'), 
+                                             (dietary_conflicts, 'dietary'), 
+                                             (mixed_conflicts, 'mixed')]:
+            # Una sola pasada: conteos y sumas por nivel a la vez
+            n1 = s1_ingredients = s1_dishes = n2 = s2_ingredients = s2_dishes = sim_sum = 0
+            for c in conflict_list:
+                level = c.get('adaptation_level')
+                sim_sum += c.get('similarity_after', 0) - c.get('similarity_before', 0)
+                if level == 1:
+                    n1 += 1
+                    s1_ingredients += c.get('ingredients_substituted', 0)
+                    s1_dishes += c.get('dishes_replaced', 0)
+                elif level == 2:
+                    n2 += 1
+                    s2_ingredients += c.get('ingredients_substituted', 0)
+                    s2_dishes += c.get('dishes_replaced', 0)
+            total = len(conflict_list)
             
-            if level_2_items:
-                by_conflict_type[conflict_key]['avg_ingredients_level_2'] = sum(c.get('ingredients_substituted', 0) for c in level_2_items) / len(level_2_items)
-                by_conflict_type[conflict_key]['avg_dishes_level_2'] = sum(c.get('dishes_replaced', 0) for c in level_2_items) / len(level_2_items)
-            
-            # Calculate similarity improvement
-            sim_improvements = [c.get('similarity_after', 0) - c.get('similarity_before', 0) for c in conflict_list]
-            by_conflict_type[conflict_key]['similarity_improvement'] = sum(sim_improvements) / len(sim_improvements) if sim_improvements else 0.0
+            if total > 0:
+                stats = by_conflict_type[conflict_key]
+                stats.level_1_cases = n1
+                stats.level_1_pct = (n1 / total) * 100
+                stats.level_2_cases = n2
+                stats.level_2_pct = (n2 / total) * 100
+                
+                if n1:
+                    stats.avg_ingredients_level_1 = s1_ingredients / n1
+                    stats.avg_dishes_level_1 = s1_dishes / n1
+                
+                if n2:
+                    stats.avg_ingredients_level_2 = s2_ingredients / n2
+                    stats.avg_dishes_level_2 = s2_dishes / n2
+                
+                # Mejora media de similitud
+                stats.similarity_improvement = sim_sum / total
+        
+        conflict_tables = "\n            \n            ".join(
+            _conflict_table(title, by_conflict_type[key]) for key, title in CONFLICT_TYPES
+        )
+    else:
+        conflict_tables = '<p style="color: var(--muted);">No conflict data.</p>'
     
-    # Usar el template base
-    base_template = get_html_template("Adaptation Strategies Test", has_plots=False)
+    # Estadísticas usadas en las conclusiones, enlazadas una vez (defaults compartidos, sin copiar)
+    cultural = by_conflict_type.get('cultural', EMPTY_CONFLICT_STATS)
+    dietary = by_conflict_type.get('dietary', EMPTY_CONFLICT_STATS)
     
-    html = base_template.split('</head>')[0] + """
-</head>
-<body>
-    <div class="container">
-        <h1>🔧 Adaptation Strategies Analysis</h1>
-        <p class="subtitle">Quantifying ADAPT phase behavior: ingredient substitution vs dish replacement</p>
-        
+    # Cabecera, panel de visualización y cierre son fijos y van ya codificados
+    summary_html = f"""
         <div class="panel">
             <h2>📊 Executive Summary</h2>
             <div class="stats-grid">
                 <div class="stat-card">
                     <div class="stat-label">Total Cases</div>
-                    <div class="stat-value">{}</div>
+                    <div class="stat-value">{S.total_cases}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Success Rate</div>
-                    <div class="stat-value positive">{}%</div>
+                    <div class="stat-value positive">{S.success_rate * 100}%</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Similarity Improvement</div>
-                    <div class="stat-value accent">+{:.1f}%</div>
+                    <div class="stat-value accent">+{S.similarity_improvement_pct:.1f}%</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Avg Similarity After</div>
-                    <div class="stat-value">{:.3f}</div>
+                    <div class="stat-value">{S.avg_similarity_after:.3f}</div>
                 </div>
             </div>
         </div>
@@ -2240,26 +2742,26 @@ def generate_adaptation_strategies_html(data, output_path):
                     <tr>
                         <td><strong>Level 0</strong></td>
                         <td>No adaptation needed</td>
-                        <td>{}</td>
-                        <td class="muted">{:.1f}%</td>
+                        <td>{S.level_0_no_adaptation}</td>
+                        <td class="muted">{S.level_0_pct:.1f}%</td>
                     </tr>
                     <tr>
                         <td><strong>Level 1</strong></td>
                         <td>Ingredient substitution</td>
-                        <td>{}</td>
-                        <td class="positive">{:.1f}%</td>
+                        <td>{S.level_1_ingredient_substitution}</td>
+                        <td class="positive">{S.level_1_pct:.1f}%</td>
                     </tr>
                     <tr>
                         <td><strong>Level 2</strong></td>
                         <td>Full dish replacement</td>
-                        <td>{}</td>
-                        <td class="accent">{:.1f}%</td>
+                        <td>{S.level_2_dish_replacement}</td>
+                        <td class="accent">{S.level_2_pct:.1f}%</td>
                     </tr>
                     <tr>
                         <td><strong>Level 3</strong></td>
                         <td>Rejection (no solution)</td>
-                        <td>{}</td>
-                        <td class="negative">{:.1f}%</td>
+                        <td>{S.level_3_case_rejection}</td>
+                        <td class="negative">{S.level_3_pct:.1f}%</td>
                     </tr>
                 </tbody>
             </table>
@@ -2270,19 +2772,19 @@ def generate_adaptation_strategies_html(data, output_path):
             <div class="stats-grid">
                 <div class="stat-card">
                     <div class="stat-label">Total Ingredients Substituted</div>
-                    <div class="stat-value">{}</div>
+                    <div class="stat-value">{S.total_ingredients_substituted}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Avg per Case</div>
-                    <div class="stat-value">{:.2f}</div>
+                    <div class="stat-value">{S.avg_ingredients_per_case:.2f}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Total Dishes Replaced</div>
-                    <div class="stat-value accent">{}</div>
+                    <div class="stat-value accent">{S.total_dishes_replaced}</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-label">Avg per Case</div>
-                    <div class="stat-value accent">{:.2f}</div>
+                    <div class="stat-value accent">{S.avg_dishes_per_case:.2f}</div>
                 </div>
             </div>
         </div>
@@ -2299,19 +2801,19 @@ def generate_adaptation_strategies_html(data, output_path):
                 <tbody>
                     <tr>
                         <td>Similarity before adaptation</td>
-                        <td class="muted">{:.3f}</td>
+                        <td class="muted">{S.avg_similarity_before:.3f}</td>
                     </tr>
                     <tr>
                         <td>Similarity after adaptation</td>
-                        <td class="positive">{:.3f}</td>
+                        <td class="positive">{S.avg_similarity_after:.3f}</td>
                     </tr>
                     <tr>
                         <td>Absolute improvement</td>
-                        <td class="accent"><strong>+{:.3f}</strong></td>
+                        <td class="accent"><strong>+{S.similarity_improvement:.3f}</strong></td>
                     </tr>
                     <tr>
                         <td>Percentage improvement</td>
-                        <td class="accent"><strong>+{:.1f}%</strong></td>
+                        <td class="accent"><strong>+{S.similarity_improvement_pct:.1f}%</strong></td>
                     </tr>
                 </tbody>
             </table>
@@ -2319,178 +2821,155 @@ def generate_adaptation_strategies_html(data, output_path):
         
         <div class="panel">
             <h2>📊 Analysis by Conflict Type</h2>
-            <h3 style="color: var(--accent); margin: 16px 0 8px;">Cultural Conflicts</h3>
-            <table class="metrics-table">
-                <thead>
-                    <tr><th>Strategy</th><th>Cases</th><th>%</th><th>Avg Ingr. Subs</th><th>Avg Dishes Changed</th><th>Similarity Improvement</th></tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>Level 1 (ingredients)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                    <tr>
-                        <td>Level 2 (dishes)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                </tbody>
-            </table>
-            
-            <h3 style="color: var(--accent); margin: 16px 0 8px;">Dietary Conflicts</h3>
-            <table class="metrics-table">
-                <thead>
-                    <tr><th>Strategy</th><th>Cases</th><th>%</th><th>Avg Ingr. Subs</th><th>Avg Dishes Changed</th><th>Similarity Improvement</th></tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>Level 1 (ingredients)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                    <tr>
-                        <td>Level 2 (dishes)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                </tbody>
-            </table>
-            
-            <h3 style="color: var(--accent); margin: 16px 0 8px;">Mixed Conflicts</h3>
-            <table class="metrics-table">
-                <thead>
-                    <tr><th>Strategy</th><th>Cases</th><th>%</th><th>Avg Ingr. Subs</th><th>Avg Dishes Changed</th><th>Similarity Improvement</th></tr>
-                </thead>
-                <tbody>
-                    <tr>
-                        <td>Level 1 (ingredients)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                    <tr>
-                        <td>Level 2 (dishes)</td>
-                        <td>{}</td>
-                        <td>{:.1f}%</td>
-                        <td>{:.2f}</td>
-                        <td>{:.2f}</td>
-                        <td class="accent">+{:.3f}</td>
-                    </tr>
-                </tbody>
-            </table>
-        </div>
-        
-        <div class="panel">
-            <h2>📊 Visualization</h2>
-            <div class="plot-container">
-                <img src="../plots/adaptation_strategies_breakdown.png" alt="Adaptation Strategies" style="max-width: 100%; height: auto;">
-            </div>
+            {conflict_tables}
         </div>
-        
+"""
+    insights_html = f"""        
         <div class="panel">
             <h2>💡 Key Insights</h2>
             <ul style="color: var(--muted); line-height: 1.8;">
-                <li><strong>Dominant Strategy:</strong> Level 2 (dish replacement) used in {:.1f}% of cases</li>
-                <li><strong>Granular Adaptations:</strong> Level 1 (ingredient substitution) used in {:.1f}% of cases</li>
-                <li><strong>Similarity Improvement:</strong> Average gain of {:.1f}% after adaptation</li>
-                <li><strong>Dishes vs Ingredients:</strong> {:.1f} dishes replaced per case vs {:.2f} ingredients substituted</li>
-                <li><strong>Conflict Patterns:</strong> Cultural conflicts show {:.1f}% Level 1 usage, dietary show {:.1f}%</li>
+                <li><strong>Dominant Strategy:</strong> Level 2 (dish replacement) used in {S.level_2_pct:.1f}% of cases</li>
+                <li><strong>Granular Adaptations:</strong> Level 1 (ingredient substitution) used in {S.level_1_pct:.1f}% of cases</li>
+                <li><strong>Similarity Improvement:</strong> Average gain of {S.similarity_improvement_pct:.1f}% after adaptation</li>
+                <li><strong>Dishes vs Ingredients:</strong> {S.avg_dishes_per_case:.1f} dishes replaced per case vs {S.avg_ingredients_per_case:.2f} ingredients substituted</li>
+                <li><strong>Conflict Patterns:</strong> Cultural conflicts show {cultural.level_1_pct:.1f}% Level 1 usage, dietary show {dietary.level_1_pct:.1f}%</li>
             </ul>
         </div>
         
-        <div class="timestamp">Generated: {}</div>
-    </div>
-</body>
-</html>
-""".format(
-        summary.get('total_cases', 0),
-        effectiveness.get('success_rate', 0.0) * 100,
-        effectiveness.get('similarity_improvement_pct', 0.0),
-        effectiveness.get('avg_similarity_after', 0.0),
-        
-        strategy_distribution.get('level_0', 0),
-        strategy_distribution.get('level_0_pct', 0.0),
-        strategy_distribution.get('level_1', 0),
-        strategy_distribution.get('level_1_pct', 0.0),
-        strategy_distribution.get('level_2', 0),
-        strategy_distribution.get('level_2_pct', 0.0),
-        strategy_distribution.get('level_3', 0),
-        strategy_distribution.get('level_3_pct', 0.0),
-        
-        granularity.get('total_ingredients_substituted', 0),
-        granularity.get('avg_ingredients_per_case', 0.0),
-        granularity.get('total_dishes_replaced', 0),
-        granularity.get('avg_dishes_per_case', 0.0),
-        
-        effectiveness.get('avg_similarity_before', 0.0),
-        effectiveness.get('avg_similarity_after', 0.0),
-        effectiveness.get('similarity_improvement', 0.0),
-        effectiveness.get('similarity_improvement_pct', 0.0),
-        
-        by_conflict_type.get('cultural', {}).get('level_1_cases', 0),
-        by_conflict_type.get('cultural', {}).get('level_1_pct', 0.0),
-        by_conflict_type.get('cultural', {}).get('avg_ingredients_level_1', 0.0),
-        by_conflict_type.get('cultural', {}).get('avg_dishes_level_1', 0.0),
-        by_conflict_type.get('cultural', {}).get('similarity_improvement', 0.0),
-        by_conflict_type.get('cultural', {}).get('level_2_cases', 0),
-        by_conflict_type.get('cultural', {}).get('level_2_pct', 0.0),
-        by_conflict_type.get('cultural', {}).get('avg_ingredients_level_2', 0.0),
-        by_conflict_type.get('cultural', {}).get('avg_dishes_level_2', 0.0),
-        by_conflict_type.get('cultural', {}).get('similarity_improvement', 0.0),
-        
-        by_conflict_type.get('dietary', {}).get('level_1_cases', 0),
-        by_conflict_type.get('dietary', {}).get('level_1_pct', 0.0),
-        by_conflict_type.get('dietary', {}).get('avg_ingredients_level_1', 0.0),
-        by_conflict_type.get('dietary', {}).get('avg_dishes_level_1', 0.0),
-        by_conflict_type.get('dietary', {}).get('similarity_improvement', 0.0),
-        by_conflict_type.get('dietary', {}).get('level_2_cases', 0),
-        by_conflict_type.get('dietary', {}).get('level_2_pct', 0.0),
-        by_conflict_type.get('dietary', {}).get('avg_ingredients_level_2', 0.0),
-        by_conflict_type.get('dietary', {}).get('avg_dishes_level_2', 0.0),
-        by_conflict_type.get('dietary', {}).get('similarity_improvement', 0.0),
-        
-        by_conflict_type.get('mixed', {}).get('level_1_cases', 0),
-        by_conflict_type.get('mixed', {}).get('level_1_pct', 0.0),
-        by_conflict_type.get('mixed', {}).get('avg_ingredients_level_1', 0.0),
-        by_conflict_type.get('mixed', {}).get('avg_dishes_level_1', 0.0),
-        by_conflict_type.get('mixed', {}).get('similarity_improvement', 0.0),
-        by_conflict_type.get('mixed', {}).get('level_2_cases', 0),
-        by_conflict_type.get('mixed', {}).get('level_2_pct', 0.0),
-        by_conflict_type.get('mixed', {}).get('avg_ingredients_level_2', 0.0),
-        by_conflict_type.get('mixed', {}).get('avg_dishes_level_2', 0.0),
-        by_conflict_type.get('mixed', {}).get('similarity_improvement', 0.0),
-        
-        strategy_distribution.get('level_2_pct', 0.0),
-        strategy_distribution.get('level_1_pct', 0.0),
-        effectiveness.get('similarity_improvement_pct', 0.0),
-        granularity.get('avg_dishes_per_case', 0.0),
-        granularity.get('avg_ingredients_per_case', 0.0),
-        by_conflict_type.get('cultural', {}).get('level_1_pct', 0.0),
-        by_conflict_type.get('dietary', {}).get('level_1_pct', 0.0),
-        
-        data.get('timestamp', 'N/A')
-    )
+        <div class="timestamp">Generated: {escape(str(data['timestamp']))}</div>
+"""
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    _write_html_stream(output_path, (ADAPTATION_PAGE_OPEN, summary_html, ADAPTATION_VISUALIZATION,
+                                     insights_html, ADAPTATION_PAGE_CLOSE))
+    return output_path
+
+
+# Reportes a generar: (JSON de resultados, HTML de salida, generador)
+GENERATORS: Final[Tuple[Tuple[str, str, Callable], ...]] = (
+    ('test_adaptive_weights.json', 'report_adaptive_weights.html', generate_adaptive_weights_html),
+    ('test_adaptive_learning.json', 'report_adaptive_learning.html', generate_adaptive_learning_html),
+    ('test_semantic_retrieve.json', 'report_semantic_retrieve.html', generate_semantic_retrieve_html),
+    ('test_user_simulation.json', 'report_user_simulation.html', generate_user_simulation_html),
+    ('test_complete_cbr_cycle.json', 'report_complete_cbr_cycle.html', generate_complete_cbr_cycle_html),
+    ('test_negative_cases.json', 'report_negative_cases.html', generate_negative_cases_html),
+    ('test_dietary_restrictions.json', 'report_dietary_restrictions.html', generate_dietary_restrictions_html),
+    ('test_semantic_cultural_adaptation.json', 'report_semantic_cultural_adaptation.html', generate_semantic_cultural_html),
+    ('test_semantic_retain.json', 'report_semantic_retain.html', generate_semantic_retain_html),
+    ('test_adaptation_strategies.json', 'report_adaptation_strategies.html', generate_adaptation_strategies_html),
+)
+
+# Registro nombre -> generador: a los procesos del pool solo se les pasa el nombre
+REPORT_GENERATORS: Final[Dict[str, Callable]] = {generator_func.__name__: generator_func for _, _, generator_func in GENERATORS}
+
+RESULTS_DIR: Final[Path] = Path('data/results')
+HTMLS_DIR: Final[Path] = Path('data/htmls')
+
+# Plots (en PLOTS_DIR) de cada reporte: si aparecen o cambian después del HTML, se regenera
+REPORT_IMAGES: Final[Dict[str, Tuple[str, ...]]] = {
+    generate_adaptive_weights_html.__name__: (WEIGHT_EVOLUTION_PNG,),
+    generate_adaptive_learning_html.__name__: (FEEDBACK_CORRELATION_PNG,),
+    generate_user_simulation_html.__name__: (FEEDBACK_EVOLUTION_PNG,),
+}
+
+# Trabajos con las rutas ya resueltas: (JSON, ruta del JSON, ruta del HTML, HTML, nombre del generador)
+REPORT_JOBS: Final[Tuple[Tuple[str, Path, Path, str, str], ...]] = tuple(
+    (json_file, RESULTS_DIR / json_file, HTMLS_DIR / html_file, html_file, generator_func.__name__)
+    for json_file, html_file, generator_func in GENERATORS
+)
+
+
+def _generate_report(generator_name, json_path, output_path):
+    """Carga un JSON de resultados y genera su reporte (se ejecuta en un proceso del pool, sin imprimir: el progreso lo informa el proceso principal)."""
+    return REPORT_GENERATORS[generator_name](load_json(json_path), output_path)
 
 
-def generate_test_html(master_report=None, verbose=True):
+def _file_mtimes(directory):
+    """Nombre -> `st_mtime_ns` de los ficheros de `directory` (vacío si no existe)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+def _report_outputs(html_file, generated_htmls):
+    """Salidas de un reporte: su HTML, las partes que ya tenga (si está paginado) y la copia `.gz` de cada uno."""
+    prefix = f"{html_file.partition('.')[0]}_part"
+    parts = sorted({name.removesuffix('.gz') for name in generated_htmls if name.startswith(prefix)})
+    return [name + suffix for name in (html_file, *parts) for suffix in ('', '.gz')]
+
+
+def _is_up_to_date(input_mtimes, output_mtimes):
+    """Indica si existen todas las salidas (HTML, partes y sus `.gz`) y son posteriores a todas las entradas (JSON, plots y este módulo)."""
+    return None not in output_mtimes and min(output_mtimes) >= max(GENERATOR_MTIME_NS, *input_mtimes)
+
+
+@dataclass(slots=True)
+class GenerationSummary:
+    """Resultado de una tanda de generación: nombres de fichero por estado."""
+    generated: list = field(default_factory=list)
+    up_to_date: list = field(default_factory=list)
+    missing: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def _run_generators(verbose=True, force=False):
+    """Genera cada reporte cuyo JSON exista y esté desactualizado, y después el índice; devuelve un GenerationSummary."""
+    # Sin memoizar: HTMLS_DIR es relativo al directorio de trabajo, que puede cambiar entre llamadas
+    os.makedirs(HTMLS_DIR, exist_ok=True)
+    ensure_report_css(HTMLS_DIR)
+    
+    # Un único listado por directorio en lugar de un stat() por cada JSON/HTML/plot
+    existing = _file_mtimes(RESULTS_DIR)
+    generated_htmls = {} if force else _file_mtimes(HTMLS_DIR)
+    plots = _file_mtimes(PLOTS_DIR)
+    
+    # Cada reporte es independiente (su JSON -> su HTML): se reparten entre procesos
+    futures = {}
+    summary = GenerationSummary()
+    _print = print
+    # Un único timestamp para toda la tanda, fijado en cada proceso del pool al arrancar
+    timestamp = datetime.now().strftime(FOOTER_TIME_FORMAT)
+    with ProcessPoolExecutor(max_workers=min(len(REPORT_JOBS), os.cpu_count() or 1),
+                             initializer=_set_batch_timestamp, initargs=(timestamp,)) as executor:
+        submit = executor.submit
+        # El índice solo enlaza a rutas fijas: no espera a los reportes y va en paralelo con ellos
+        index_future = submit(generate_index_html, HTMLS_DIR)
+        for json_file, json_path, output_path, html_file, generator_name in REPORT_JOBS:
+            if json_file not in existing:
+                summary.missing.append(json_file)
+                if verbose:
+                    _print(f"   ⏭️  Skipped {json_file} (not found)")
+            elif _is_up_to_date(
+                [existing[json_file], *(plots[name] for name in REPORT_IMAGES.get(generator_name, ()) if name in plots)],
+                [generated_htmls.get(name) for name in _report_outputs(html_file, generated_htmls)],
+            ):
+                summary.up_to_date.append(html_file)
+                if verbose:
+                    _print(f"   ⏭️  Skipped {html_file} (up to date)")
+            else:
+                futures[submit(_generate_report, generator_name, json_path, output_path)] = html_file
+        
+        # El progreso (y los errores) se informa solo desde el proceso principal según van terminando
+        futures[index_future] = 'index.html'
+        for future in as_completed(futures):
+            html_file = futures[future]
+            try:
+                future.result()
+            except Exception as e:  # un reporte roto no aborta el resto de la tanda
+                summary.failed.append(html_file)
+                if verbose:
+                    _print(f"   ❌ Failed: {html_file} ({type(e).__name__}: {e})")
+                continue
+            if future is not index_future:
+                summary.generated.append(html_file)
+                if verbose:
+                    _print(f"    Generated: {html_file}")
+    
+    return summary
+
+
+def generate_test_html(master_report=None, verbose=True, force=False):
     """
     Genera todos los reportes HTML.
     Esta es la interfaz llamada desde run_tests.py.
@@ -2498,81 +2977,40 @@ def generate_test_html(master_report=None, verbose=True):
     Args:
         master_report: Reporte maestro (no usado actualmente, genera desde JSONs)
         verbose: Si imprimir mensajes de progreso
-    """
-    results_dir = Path('data/results')
-    htmls_dir = Path('data/htmls')
-    htmls_dir.mkdir(exist_ok=True)
+        force: Regenerar también los reportes posteriores a su JSON
     
+    Returns:
+        GenerationSummary con los reportes generados, al día, sin JSON y fallidos
+    """
     if verbose:
         print("📄 Generating visual HTML reports...")
     
-    generators = {
-        'test_adaptive_weights.json': ('report_adaptive_weights.html', generate_adaptive_weights_html),
-        'test_adaptive_learning.json': ('report_adaptive_learning.html', generate_adaptive_learning_html),
-        'test_semantic_retrieve.json': ('report_semantic_retrieve.html', generate_semantic_retrieve_html),
-        'test_user_simulation.json': ('report_user_simulation.html', generate_user_simulation_html),
-        'test_complete_cbr_cycle.json': ('report_complete_cbr_cycle.html', generate_complete_cbr_cycle_html),
-        'test_negative_cases.json': ('report_negative_cases.html', generate_negative_cases_html),
-        'test_dietary_restrictions.json': ('report_dietary_restrictions.html', generate_dietary_restrictions_html),
-        'test_semantic_cultural_adaptation.json': ('report_semantic_cultural_adaptation.html', generate_semantic_cultural_html),
-        'test_semantic_retain.json': ('report_semantic_retain.html', generate_semantic_retain_html),
-        'test_adaptation_strategies.json': ('report_adaptation_strategies.html', generate_adaptation_strategies_html),
-    }
-    
-    generated = 0
-    for json_file, (html_file, generator_func) in generators.items():
-        json_path = results_dir / json_file
-        if json_path.exists():
-            data = load_json(json_path)
-            generator_func(data, htmls_dir / html_file)
-            generated += 1
-            if verbose:
-                print(f"    {html_file}")
-        elif verbose:
-            print(f"   ⏭️  Skipped {json_file} (not found)")
-    
-    # Generate index.html
-    generate_index_html(htmls_dir)
+    summary = _run_generators(verbose, force)
     
     if verbose:
-        print(f"\n   Generated {generated} HTML reports in {htmls_dir}/")
+        print(f"\n   Generated {len(summary.generated)} HTML reports in {HTMLS_DIR}/"
+              f" ({len(summary.up_to_date)} up to date, skipped)")
+        if summary.failed:
+            print(f"   ⚠ {len(summary.failed)} failed: {', '.join(summary.failed)}")
+    return summary
 
 
 def main():
     """Genera todos los reportes HTML (modo standalone)."""
-    results_dir = Path('data/results')
-    htmls_dir = Path('data/htmls')
-    htmls_dir.mkdir(exist_ok=True)
-    
     print("🚀 Generating enhanced HTML reports...\n")
     
-    generators = {
-        'test_adaptive_weights.json': ('report_adaptive_weights.html', generate_adaptive_weights_html),
-        'test_adaptive_learning.json': ('report_adaptive_learning.html', generate_adaptive_learning_html),
-        'test_semantic_retrieve.json': ('report_semantic_retrieve.html', generate_semantic_retrieve_html),
-        'test_user_simulation.json': ('report_user_simulation.html', generate_user_simulation_html),
-        'test_complete_cbr_cycle.json': ('report_complete_cbr_cycle.html', generate_complete_cbr_cycle_html),
-        'test_negative_cases.json': ('report_negative_cases.html', generate_negative_cases_html),
-        'test_semantic_cultural_adaptation.json': ('report_semantic_cultural_adaptation.html', generate_semantic_cultural_html),
-        'test_semantic_retain.json': ('report_semantic_retain.html', generate_semantic_retain_html),
-        'test_dietary_restrictions.json': ('report_dietary_restrictions.html', generate_dietary_restrictions_html),
-        'test_adaptation_strategies.json': ('report_adaptation_strategies.html', generate_adaptation_strategies_html),
-    }
-    
-    for json_file, (html_file, generator_func) in generators.items():
-        json_path = results_dir / json_file
-        if json_path.exists():
-            data = load_json(json_path)
-            generator_func(data, htmls_dir / html_file)
-        else:
-            print(f"⚠  Skipped {json_file} (not found)")
-    
-    # Generate index
-    generate_index_html(htmls_dir)
-    
-    print("\n All HTML reports generated successfully!")
-    print(f"📁 Location: {htmls_dir.absolute()}")
+    summary = _run_generators(verbose=True)
+    
+    if summary.failed:
+        print(f"\n⚠ {len(summary.failed)} HTML reports failed: {', '.join(summary.failed)}")
+    elif summary.generated:
+        print(f"\n {len(summary.generated)} HTML reports generated successfully!"
+              f" ({len(summary.up_to_date)} already up to date)")
+    else:
+        print(f"\n All {len(summary.up_to_date)} HTML reports already up to date (nothing regenerated)")
+    print(f"📁 Location: {HTMLS_DIR.absolute()}")
+    return 1 if summary.failed else 0
 
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+"""
+Tests unitarios del generador de reportes HTML (`html_generator.py`).
+
+Ejecutar con: python -m pytest tests/test_html_generator.py
+"""
+
+import sys
+import json
+import base64
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import html_generator
+
+# Resultados reales del repositorio, usados como base de algunos casos
+RESULTS_DIR = Path(__file__).parent.parent / 'data' / 'results'
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def json_backend(request, monkeypatch):
+    """Ejecuta el test con orjson (si está instalado) y con el fallback de la librería estándar."""
+    if request.param == 'orjson':
+        if html_generator.orjson is None:
+            pytest.skip("orjson no instalado")
+    else:
+        monkeypatch.setattr(html_generator, 'orjson', None)
+    return request.param
+
+
+def test_to_json_replaces_non_finite_floats_with_null(json_backend):
+    data = {'a': [1.5, float('nan'), float('inf')], 'b': (float('-inf'), 2), 'c': 'x'}
+    text = html_generator._to_json(data)
+    assert json.loads(text, parse_constant=pytest.fail) == {'a': [1.5, None, None], 'b': [None, 2], 'c': 'x'}
+
+
+def test_to_json_stdlib_fallback_matches_orjson(monkeypatch):
+    if html_generator.orjson is None:
+        pytest.skip("orjson no instalado")
+    data = {'series': [0.25, float('nan'), 3], 'label': 'ñ</script>'}
+    expected = html_generator._to_json(data)
+    monkeypatch.setattr(html_generator, 'orjson', None)
+    assert html_generator._to_json(data) == expected
+
+
+@pytest.mark.parametrize('values, expected', [
+    ([0.5, 2, 3.25], 'new Float64Array([0.5,2,3.25])'),
+    ([0.5, None, 1.0], '[0.5,null,1.0]'),
+    ([float('nan'), 1.0], '[null,1.0]'),
+])
+def test_js_float_array_keeps_gaps_as_null(json_backend, values, expected):
+    assert html_generator._js_float_array(values) == expected
+
+
+JSON_BLOCK = re.compile(r'<script id="(\w+)" type="application/json">(.*?)</script>', re.S)
+
+
+def _json_blocks(html_path):
+    """Bloques `application/json` del reporte, parseados como lo haría JSON.parse (sin NaN/Infinity)."""
+    html = Path(html_path).read_text(encoding='utf-8')
+    return {block_id: json.loads(text, parse_constant=pytest.fail) for block_id, text in JSON_BLOCK.findall(html)}
+
+
+def test_nan_in_result_file_keeps_plot_data_parseable(json_backend, tmp_path):
+    results = tmp_path / 'test_semantic_cultural_adaptation.json'
+    results.write_text(json.dumps({
+        'summary': {'total_adaptations': 3, 'avg_retrieval_similarity': 0.5},
+        'test_cases': [
+            {'target_culture': 'Italian',
+             'retrieval': {'top_similarity': float('nan'), 'avg_similarity': 0.4},
+             'adaptation': {'cultural_adaptations_applied': 2, 'total_price': float('inf')}},
+            {'target_culture': 'Japanese',
+             'retrieval': {'top_similarity': 0.9, 'avg_similarity': 0.7},
+             'adaptation': {'cultural_adaptations_applied': 1, 'total_price': 40.0}},
+        ],
+    }))
+    output = tmp_path / 'report.html'
+    html_generator.generate_semantic_cultural_html(html_generator.load_json(results), output)
+    
+    blocks = _json_blocks(output)
+    assert blocks['culturalData']['topSim'] == [None, 0.9]
+    assert blocks['culturalData']['avgSim'] == [0.4, 0.7]
+
+
+@pytest.mark.parametrize('interactive', [False, True])
+def test_semantic_retain_handles_null_decision(interactive, tmp_path):
+    data = {
+        'summary': {'initial_cases': 2, 'final_cases': 3, 'retention_rate': 0.5},
+        'test_cases': [
+            {'description': 'Sin decisión', 'menu_culture': 'Italian', 'decision': None},
+            {'description': 'Añadido', 'menu_culture': 'Japanese',
+             'decision': {'action': 'add_new', 'retained': True, 'reason': 'Nuevo'}},
+        ],
+    }
+    output = tmp_path / 'report.html'
+    html_generator.generate_semantic_retain_html(data, output, interactive=interactive)
+    
+    html = output.read_text(encoding='utf-8')
+    assert 'Test 1: Sin decisión' in html
+    assert ('UNKNOWN' in html) != interactive
+    if interactive:
+        assert _json_blocks(output)['retainData']['actions'] == ['unknown', 'add_new']
+
+
+def test_standalone_generator_writes_stylesheet_next_to_output(tmp_path):
+    output = tmp_path / 'standalone' / 'report.html'
+    output.parent.mkdir()
+    html_generator.generate_semantic_cultural_html({'summary': {}, 'test_cases': []}, output)
+    
+    assert 'href="styles.css"' in output.read_text(encoding='utf-8')
+    assert (output.parent / 'styles.css').read_text(encoding='utf-8') == html_generator.REPORT_CSS
+    assert (output.parent / 'styles.css.gz').exists()
+
+
+def test_retain_and_cycle_action_labels_are_escaped(tmp_path):
+    retain = tmp_path / 'retain.html'
+    html_generator.generate_semantic_retain_html({'test_cases': [
+        {'description': 'x', 'decision': {'action': '<img src=x onerror=alert(1)>', 'retained': False}},
+    ]}, retain)
+    page = retain.read_text(encoding='utf-8')
+    assert '<Img' not in page and '&lt;Img Src=X Onerror=Alert(1)&gt;' in page
+
+    cycle = tmp_path / 'cycle.html'
+    data = json.loads((RESULTS_DIR / 'test_complete_cbr_cycle.json').read_text(encoding='utf-8'))
+    data['scenarios'][0]['phases']['retain']['retention_action'] = '<b>add_new</b>'
+    html_generator.generate_complete_cbr_cycle_html(data, cycle)
+    page = cycle.read_text(encoding='utf-8')
+    # title() convierte la etiqueta en <B>, que debe llegar escapada
+    assert '<B>' not in page and '&lt;B&gt;Add New&lt;/B&gt;' in page
+
+
+def test_generators_return_path_without_printing(tmp_path, capsys):
+    data = {'summary': {}, 'test_cases': []}
+    output = tmp_path / 'report.html'
+    assert html_generator.generate_semantic_cultural_html(data, output) == output
+    assert capsys.readouterr().out == ''
+
+
+def _write_results(root, name, data):
+    """Escribe un JSON de resultados en `root/data/results`."""
+    results_dir = root / 'data' / 'results'
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / name
+    path.write_text(data if isinstance(data, str) else json.dumps(data), encoding='utf-8')
+    return path
+
+
+def test_run_reports_failures_without_aborting_the_batch(tmp_path, monkeypatch, capfd):
+    monkeypatch.chdir(tmp_path)
+    _write_results(tmp_path, 'test_semantic_cultural_adaptation.json', {'summary': {}, 'test_cases': []})
+    _write_results(tmp_path, 'test_semantic_retain.json', '{"test_cases": [')
+    
+    summary = html_generator.generate_test_html(verbose=False)
+    
+    assert summary.generated == ['report_semantic_cultural_adaptation.html']
+    assert summary.failed == ['report_semantic_retain.html']
+    assert 'test_adaptive_weights.json' in summary.missing
+    assert capfd.readouterr().out == ''  # tampoco imprimen los procesos del pool
+    assert (tmp_path / 'data' / 'htmls' / 'index.html').exists()
+
+
+@pytest.mark.parametrize('length', [1, 2, 499, 500, 501, 999, 1000, 1001, 1499, 2500, 12345])
+def test_downsample_caps_points_and_keeps_endpoints(length):
+    values = list(range(length))
+    sampled = html_generator._downsample(values)
+    assert len(sampled) <= html_generator.MAX_PLOT_POINTS
+    assert sampled[0] == values[0]
+    assert sampled[-1] == values[-1]
+    assert sampled == sorted(set(sampled))
+
+
+@pytest.mark.parametrize('max_points', [2, 3, 7, 100])
+def test_downsample_respects_custom_cap(max_points):
+    for length in range(1, 400):
+        sampled = html_generator._downsample(list(range(length)), max_points)
+        assert len(sampled) <= max_points
+        assert sampled[0] == 0 and sampled[-1] == length - 1
+
+
+def test_run_skips_only_fully_up_to_date_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(html_generator.REPORT_IMAGES, 'generate_semantic_cultural_html', ('cultural.png',))
+    _write_results(tmp_path, 'test_semantic_cultural_adaptation.json', {'summary': {}, 'test_cases': []})
+    htmls = tmp_path / 'data' / 'htmls'
+    report = 'report_semantic_cultural_adaptation.html'
+    
+    def run():
+        summary = html_generator.generate_test_html(verbose=False)
+        return summary.generated, summary.up_to_date
+    
+    assert run() == ([report], [])
+    assert run() == ([], [report])
+    
+    # Salidas borradas: la copia .gz regenera el reporte; styles.css se vuelve a escribir
+    (htmls / f'{report}.gz').unlink()
+    (htmls / 'styles.css').unlink()
+    assert run() == ([report], [])
+    assert (htmls / f'{report}.gz').exists() and (htmls / 'styles.css').exists()
+    
+    # Un plot que aparece después del HTML también lo deja obsoleto
+    plot = tmp_path / 'data' / 'plots' / 'cultural.png'
+    plot.parent.mkdir(parents=True)
+    plot.write_bytes(b'png')
+    earlier = plot.stat().st_mtime_ns - 10**9
+    for name in (report, f'{report}.gz'):
+        os.utime(htmls / name, ns=(earlier, earlier))
+    assert run() == ([report], [])
+    assert run() == ([], [report])
+
+
+@pytest.mark.parametrize('size', [0, 1, html_generator.IMAGE_CHUNK_SIZE + 2])
+def test_encode_image_base64_matches_stdlib(tmp_path, size):
+    image = tmp_path / 'plot.png'
+    image.write_bytes(os.urandom(size))
+    expected = base64.b64encode(image.read_bytes()).decode('ascii')
+    assert html_generator.encode_image_base64(image) == f"data:image/png;base64,{expected}"
+    assert html_generator.encode_image_base64(tmp_path / 'missing.png') is None
+
+
+def test_negative_case_evolution_is_a_grouped_svg(tmp_path):
+    data = json.loads((RESULTS_DIR / 'test_negative_cases.json').read_text(encoding='utf-8'))
+    output = tmp_path / 'negative.html'
+    html_generator.generate_negative_cases_html(data, output)
+    
+    page = output.read_text(encoding='utf-8')
+    assert 'caseEvolutionPlot' not in page
+    svg = page[page.index('<svg'):page.index('</svg>')]
+    assert svg.count('<rect') == 2 * 2 + 2  # dos series de dos barras y la leyenda
+    assert '>Initial</text>' in svg and '>Final</text>' in svg
+
+
+def test_paginated_report_removes_stale_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_generator, 'MAX_SCENARIOS_PER_FILE', 2)
+    data = json.loads((RESULTS_DIR / 'test_negative_cases.json').read_text(encoding='utf-8'))
+    output = tmp_path / 'report_negative_cases.html'
+    
+    def parts():
+        return sorted(path.name for path in tmp_path.glob('report_negative_cases_part*'))
+    
+    html_generator.generate_negative_cases_html({**data, 'scenarios': data['scenarios'][:5]}, output)
+    assert len(parts()) == 3 * 2  # cada parte con su .gz
+    
+    html_generator.generate_negative_cases_html({**data, 'scenarios': data['scenarios'][:3]}, output)
+    assert parts() == ['report_negative_cases_part1.html', 'report_negative_cases_part1.html.gz',
+                       'report_negative_cases_part2.html', 'report_negative_cases_part2.html.gz']
+    
+    html_generator.generate_negative_cases_html({**data, 'scenarios': data['scenarios'][:2]}, output)
+    assert parts() == []
+
+
+def test_run_regenerates_report_with_a_missing_part(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = json.loads((RESULTS_DIR / 'test_negative_cases.json').read_text(encoding='utf-8'))
+    # Sin monkeypatch: los procesos del pool no tienen por qué heredarlo
+    scenarios = (data['scenarios'] * html_generator.MAX_SCENARIOS_PER_FILE)[:html_generator.MAX_SCENARIOS_PER_FILE + 1]
+    _write_results(tmp_path, 'test_negative_cases.json', {**data, 'scenarios': scenarios})
+    report = 'report_negative_cases.html'
+    
+    assert html_generator.generate_test_html(verbose=False).generated == [report]
+    assert html_generator.generate_test_html(verbose=False).up_to_date == [report]
+    (tmp_path / 'data' / 'htmls' / 'report_negative_cases_part2.html.gz').unlink()
+    assert html_generator.generate_test_html(verbose=False).generated == [report]